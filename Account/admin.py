@@ -9,12 +9,14 @@ class CustomUserAdmin(admin.ModelAdmin):
 
 @admin.register(VerificationToken)
 class VerificationTokenAdmin(admin.ModelAdmin):
-    list_display = ('user', 'token', 'created_at', 'expires_at')
-    search_fields = ('user__email', 'token')
-    readonly_fields = ('created_at',)
+    list_display = ('user', 'token_prefix', 'created_at', 'expires_at')
+    list_select_related = ('user',)
+    search_fields = ('user__email', 'token_prefix')
+    readonly_fields = ('token_prefix', 'token_hash', 'created_at')
 
 @admin.register(PasswordResetToken)
 class PasswordResetTokenAdmin(admin.ModelAdmin):
-    list_display = ('user', 'token', 'created_at', 'expires_at')
-    search_fields = ('user__email', 'token')
-    readonly_fields = ('created_at',)
+    list_display = ('user', 'token_prefix', 'created_at', 'expires_at')
+    list_select_related = ('user',)
+    search_fields = ('user__email', 'token_prefix')
+    readonly_fields = ('token_prefix', 'token_hash', 'created_at')
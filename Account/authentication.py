@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+DATETIME_FIELD = serializers.DateTimeField()
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that loads the user's profile with the user"""
+
+    def get_user(self, validated_token):
+        """
+        Same checks as JWTAuthentication.get_user, but loads the profile and
+        its organization in the same query since nearly every view reads
+        request.user.profile.organization. Columns only used at login are
+        left deferred; they load on first access if a view needs them.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        check_revoke = getattr(api_settings, 'CHECK_REVOKE_TOKEN', False)
+        deferred = ['last_login', 'date_joined'] if check_revoke else ['password', 'last_login', 'date_joined']
+        try:
+            user = self.user_model.objects.select_related('profile__organization').defer(*deferred).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if check_revoke:
+            from rest_framework_simplejwt.utils import get_md5_hash_password
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
+
+
+class StatelessJWTAuthentication(ProfileJWTAuthentication):
+    """
+    Builds request.user from the token claims instead of loading the user
+    row. Only suitable for views that need nothing beyond the claims added
+    by UserClaimsRefreshToken. Tokens issued without the is_active claim
+    fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+        if 'is_active' not in validated_token:
+            return super().get_user(validated_token)
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return TokenUser(validated_token)
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the profile fields, copied into its access tokens.
+    Claims are as of issue or the last refresh, so a profile edit shows up
+    in /auth/profile/ once the client refreshes, at the latest when the
+    access token expires (ACCESS_TOKEN_LIFETIME).
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        self['email'] = user.email
+        self['first_name'] = user.first_name
+        self['last_name'] = user.last_name
+        self['is_verified'] = user.is_verified
+        self['is_active'] = user.is_active
+        # Same format DRF gives datetimes everywhere else in the API
+        self['created_at'] = DATETIME_FIELD.to_representation(user.created_at)
+        self['updated_at'] = DATETIME_FIELD.to_representation(user.updated_at)
+
+
+class RotatedUserClaimsRefreshToken(UserClaimsRefreshToken):
+    """
+    UserClaimsRefreshToken that re-reads the user when a token string is
+    loaded, so each refresh issues current claims and inactive or deleted
+    users can no longer refresh
+    """
+
+    def __init__(self, token=None, verify=True):
+        super().__init__(token, verify)
+        if token is None:
+            return
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(**{api_settings.USER_ID_FIELD: self[api_settings.USER_ID_CLAIM]})
+        except (KeyError, user_model.DoesNotExist):
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        self.set_user_claims(user)
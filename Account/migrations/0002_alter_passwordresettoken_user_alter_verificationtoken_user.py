@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-15 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def keep_newest_token_per_user(apps, schema_editor):
+    """Delete all but the newest token of each user so the unique constraint can be added"""
+    for model_name in ('VerificationToken', 'PasswordResetToken'):
+        Token = apps.get_model('Account', model_name)
+        seen, stale = set(), []
+        rows = Token.objects.order_by('user_id', '-created_at', '-id').values_list('id', 'user_id')
+        for token_id, user_id in rows.iterator():
+            if user_id in seen:
+                stale.append(token_id)
+            else:
+                seen.add(user_id)
+        for start in range(0, len(stale), 500):
+            Token.objects.filter(id__in=stale[start:start + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Account', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_newest_token_per_user, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='verificationtoken',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
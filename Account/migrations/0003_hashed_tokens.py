@@ -0,0 +1,59 @@
+# Generated by Django 5.0.1 on 2026-10-15 23:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    for model_name in ('VerificationToken', 'PasswordResetToken'):
+        Model = apps.get_model('Account', model_name)
+        for row in Model.objects.only('id', 'token'):
+            raw_token = str(row.token)
+            Model.objects.filter(pk=row.pk).update(
+                token_prefix=raw_token[:8],
+                token_hash=hashlib.sha256(raw_token.encode()).hexdigest()
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Account', '0002_alter_passwordresettoken_user_alter_verificationtoken_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='passwordresettoken',
+            name='token_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='passwordresettoken',
+            name='token_prefix',
+            field=models.CharField(db_index=True, default='', max_length=8),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='verificationtoken',
+            name='token_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='verificationtoken',
+            name='token_prefix',
+            field=models.CharField(db_index=True, default='', max_length=8),
+            preserve_default=False,
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='passwordresettoken',
+            name='token',
+        ),
+        migrations.RemoveField(
+            model_name='verificationtoken',
+            name='token',
+        ),
+    ]
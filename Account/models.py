@@ -1,8 +1,47 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+import hashlib
 import uuid
 from django.apps import apps
 
+EMAIL_TAKEN_CACHE_KEY = 'email_taken:{}'
+EMAIL_TAKEN_CACHE_TTL = 300
+TOKEN_PREFIX_LENGTH = 8
+
+
+def hash_token(raw_token):
+    """SHA-256 hex digest of a token as it is sent to the user"""
+    return hashlib.sha256(str(raw_token).encode()).hexdigest()
+
+
+def generate_token():
+    """
+    Create a new emailed token. Returns the raw token and the field values
+    to store; only its prefix and hash ever reach the database.
+    """
+    raw_token = str(uuid.uuid4())
+    return raw_token, {
+        'token_prefix': raw_token[:TOKEN_PREFIX_LENGTH],
+        'token_hash': hash_token(raw_token)
+    }
+
+
+def match_token(queryset, raw_token):
+    """
+    Find the token matching raw_token among the rows sharing its prefix,
+    comparing hashes in constant time.
+    """
+    raw_token = str(raw_token)
+    token_hash = hash_token(raw_token)
+    for candidate in queryset.filter(token_prefix=raw_token[:TOKEN_PREFIX_LENGTH]):
+        if constant_time_compare(candidate.token_hash, token_hash):
+            return candidate
+    return None
+
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         """
@@ -62,9 +101,15 @@ class CustomUser(AbstractUser):
         profile, created = ProfileModel.objects.get_or_create(user=self)
         return profile
 
+
+@receiver(post_delete, sender=CustomUser)
+def clear_email_taken_cache(sender, instance, **kwargs):
+    cache.delete(EMAIL_TAKEN_CACHE_KEY.format(instance.email))
+
 class VerificationToken(models.Model):
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
-    token = models.UUIDField(default=uuid.uuid4, unique=True)
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
+    token_prefix = models.CharField(max_length=TOKEN_PREFIX_LENGTH, db_index=True)
+    token_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
@@ -73,11 +118,12 @@ class VerificationToken(models.Model):
         return timezone.now() > self.expires_at
 
 class PasswordResetToken(models.Model):
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
-    token = models.UUIDField(default=uuid.uuid4, unique=True)
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
+    token_prefix = models.CharField(max_length=TOKEN_PREFIX_LENGTH, db_index=True)
+    token_hash = models.CharField(max_length=64)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
     def is_expired(self):
         from django.utils import timezone
-        return timezone.now() > self.expires_at
\ No newline at end of file
+        return timezone.now() > self.expires_at
@@ -1,6 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from .models import CustomUser, VerificationToken, PasswordResetToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from .models import (
+    CustomUser, VerificationToken, PasswordResetToken,
+    EMAIL_TAKEN_CACHE_KEY, EMAIL_TAKEN_CACHE_TTL
+)
+from .authentication import UserClaimsRefreshToken, RotatedUserClaimsRefreshToken
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 import uuid
@@ -16,7 +22,10 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         if attrs['password'] != attrs['password2']:
             raise serializers.ValidationError({"password": "Password fields didn't match."})
-        if CustomUser.objects.filter(email=attrs['email']).exists():
+        # Short-circuit repeat attempts for a known address before touching the DB
+        cache_key = EMAIL_TAKEN_CACHE_KEY.format(attrs['email'])
+        if cache.get(cache_key) or CustomUser.objects.filter(email=attrs['email']).exists():
+            cache.set(cache_key, 1, EMAIL_TAKEN_CACHE_TTL)
             raise serializers.ValidationError({"email": "Email is already in use."})
         
         return attrs
@@ -25,10 +34,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('password2')
         user = CustomUser.objects.create_user(**validated_data)
-        
+        cache.set(EMAIL_TAKEN_CACHE_KEY.format(user.email), 1, EMAIL_TAKEN_CACHE_TTL)
         
         return user
 
+class UserClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserClaimsRefreshToken
+
+class UserClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RotatedUserClaimsRefreshToken
+
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField()
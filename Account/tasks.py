@@ -0,0 +1,105 @@
+from string import Template
+
+from celery import shared_task
+from django.core.mail import send_mail
+from django.conf import settings
+from django.utils import timezone
+
+from .models import VerificationToken, PasswordResetToken
+
+REGISTRATION_EMAIL_SUBJECT = 'Verify Your Account'
+REGISTRATION_EMAIL_TMPL = Template("""
+Hello $name,
+Welcome to Scenario Forge! Please verify your email address to complete your registration.
+Click the link to verify your account: $url
+Thank you for joining us!
+""")
+
+VERIFY_EMAIL_SUBJECT = 'Verify Your Account - Scenario Forge'
+VERIFY_EMAIL_TMPL = Template("""
+Hello $name,
+
+Thank you for registering with Scenario Forge!
+
+Please verify your email address to complete your registration and start managing your risks today.
+
+Click the link below to verify your account:
+$url
+
+This link will expire in 24 hours.
+
+If you didn't create an account with Scenario Forge, please ignore this email.
+
+Best regards,
+The Scenario Forge Team
+""")
+
+RESET_EMAIL_SUBJECT = 'Reset Your Password'
+RESET_EMAIL_TMPL = Template("""
+Hello $name,
+We received a request to reset your password.
+If you did not make this request, please ignore this email.
+Click the link to reset your password: $url
+Thank you.
+""")
+
+
+@shared_task
+def send_registration_email(user_email, token_uuid):
+    """
+    Send the welcome email with the verification link to a newly registered user
+    """
+    send_mail(
+        REGISTRATION_EMAIL_SUBJECT,
+        REGISTRATION_EMAIL_TMPL.substitute(
+            name=user_email,
+            url=f"http://localhost:5173/verify-email/{token_uuid}/"
+        ),
+        settings.DEFAULT_FROM_EMAIL,
+        [user_email],
+        fail_silently=False,
+    )
+
+
+@shared_task
+def send_verification_email(user_email, first_name, token_uuid):
+    """
+    Send the account verification email again on request
+    """
+    send_mail(
+        VERIFY_EMAIL_SUBJECT,
+        VERIFY_EMAIL_TMPL.substitute(
+            name=first_name or user_email,
+            url=f"http://localhost:5173/verify-email/{token_uuid}/"
+        ),
+        settings.DEFAULT_FROM_EMAIL,
+        [user_email],
+        fail_silently=False,
+    )
+
+
+@shared_task
+def send_password_reset_email(user_email, token_uuid):
+    """
+    Send the password reset email
+    """
+    send_mail(
+        RESET_EMAIL_SUBJECT,
+        RESET_EMAIL_TMPL.substitute(
+            name=user_email,
+            url=f"http://localhost:5173/reset-password/{token_uuid}/"
+        ),
+        settings.DEFAULT_FROM_EMAIL,
+        [user_email],
+        fail_silently=False,
+    )
+
+
+@shared_task
+def purge_expired_tokens():
+    """
+    Delete expired verification and password reset tokens
+    """
+    now = timezone.now()
+    VerificationToken.objects.filter(expires_at__lt=now).delete()
+    PasswordResetToken.objects.filter(expires_at__lt=now).delete()
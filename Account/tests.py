@@ -1,3 +1,228 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import ProfileJWTAuthentication, StatelessJWTAuthentication, UserClaimsRefreshToken
+from .models import CustomUser, VerificationToken, generate_token, hash_token, match_token
+from .serializers import UserClaimsTokenRefreshSerializer
+from .tasks import send_registration_email, send_verification_email
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_user(email='user@example.com', **extra_fields):
+    return CustomUser.objects.create_user(
+        email=email, password='pass12345', first_name='Grace', last_name='Hopper', **extra_fields
+    )
+
+
+class TokenHashingTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def store_token(self, user, **kwargs):
+        raw_token, fields = generate_token()
+        fields.update(kwargs)
+        fields.setdefault('expires_at', timezone.now() + timedelta(hours=1))
+        VerificationToken.objects.create(user=user, **fields)
+        return raw_token
+
+    def test_only_prefix_and_hash_are_stored(self):
+        raw_token = self.store_token(self.user)
+        stored = VerificationToken.objects.get(user=self.user)
+        self.assertEqual(stored.token_prefix, raw_token[:len(stored.token_prefix)])
+        self.assertEqual(stored.token_hash, hash_token(raw_token))
+        self.assertNotIn(raw_token, (stored.token_prefix, stored.token_hash))
+
+    def test_match_token_picks_the_hash_match_among_prefix_collisions(self):
+        raw_token = self.store_token(self.user)
+        other = create_user(email='other@example.com')
+        # Same prefix, different secret
+        VerificationToken.objects.create(
+            user=other,
+            token_prefix=raw_token[:8],
+            token_hash=hash_token('not-the-token'),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        match = match_token(VerificationToken.objects.all(), raw_token)
+        self.assertEqual(match.user_id, self.user.id)
+
+    def test_match_token_rejects_unknown_token(self):
+        raw_token = self.store_token(self.user)
+        # Shares the stored prefix but not the rest of the token
+        forged = raw_token[:8] + str(uuid.uuid4())[8:]
+        self.assertIsNone(match_token(VerificationToken.objects.all(), forged))
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_verify_email_marks_user_verified_and_consumes_token(self):
+        raw_token = self.store_token(self.user)
+        client = APIClient()
+        response = client.post(reverse('verify-email', args=[raw_token]))
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified)
+        self.assertFalse(VerificationToken.objects.filter(user=self.user).exists())
+
+        response = client.post(reverse('verify-email', args=[raw_token]))
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_verify_email_reports_expired_token(self):
+        raw_token = self.store_token(self.user, expires_at=timezone.now() - timedelta(minutes=1))
+        response = APIClient().post(reverse('verify-email', args=[raw_token]))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'Verification token has expired')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class EmailTaskTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_register_queues_the_registration_email_after_commit(self):
+        with mock.patch('Account.views.send_registration_email') as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = APIClient().post(reverse('register'), {
+                    'email': 'new@example.com',
+                    'password': 'Sturdy-pass-42',
+                    'password2': 'Sturdy-pass-42',
+                    'first_name': 'New',
+                    'last_name': 'User',
+                }, format='json')
+        self.assertEqual(response.status_code, 201)
+        task.delay.assert_called_once()
+        email, raw_token = task.delay.call_args.args
+        self.assertEqual(email, 'new@example.com')
+        token = match_token(VerificationToken.objects.all(), raw_token)
+        self.assertEqual(token.user.email, 'new@example.com')
+
+    def test_registration_email_keeps_the_welcome_copy(self):
+        send_registration_email('new@example.com', 'abc')
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.subject, 'Verify Your Account')
+        self.assertEqual(message.to, ['new@example.com'])
+        self.assertIn('Welcome to Scenario Forge!', message.body)
+        self.assertIn('http://localhost:5173/verify-email/abc/', message.body)
+
+    def test_resent_verification_email_uses_its_own_copy(self):
+        send_verification_email('new@example.com', 'New', 'abc')
+        message = mail.outbox[0]
+        self.assertEqual(message.subject, 'Verify Your Account - Scenario Forge')
+        self.assertIn('Hello New,', message.body)
+        self.assertNotIn('Welcome to Scenario Forge!', message.body)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProfileJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.refresh = UserClaimsRefreshToken.for_user(self.user)
+        self.raw_token = str(self.refresh.access_token)
+
+    def test_every_request_verifies_the_signature(self):
+        auth = ProfileJWTAuthentication()
+        auth.get_validated_token(self.raw_token.encode())
+        with self.assertRaises(InvalidToken):
+            auth.get_validated_token(self.raw_token[:-2].encode() + b'xx')
+
+    def test_deleted_user_is_rejected_on_the_next_request(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.raw_token}')
+        response = client.post(reverse('logout'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.user.delete()
+        response = client.post(reverse('logout'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_get_user_loads_profile_in_the_same_query(self):
+        token = AccessToken(self.raw_token)
+        with self.assertNumQueries(1):
+            user = ProfileJWTAuthentication().get_user(token)
+            self.assertIsNone(user.profile.organization)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_get_user_rejects_inactive_user(self):
+        token = AccessToken(self.raw_token)
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            ProfileJWTAuthentication().get_user(token)
+
+    def test_login_only_columns_stay_deferred(self):
+        user = ProfileJWTAuthentication().get_user(AccessToken(self.raw_token))
+        self.assertTrue({'password', 'last_login', 'date_joined'} <= user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('pass12345'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+
+    def test_user_is_built_from_claims_without_queries(self):
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        with self.assertNumQueries(0):
+            user = StatelessJWTAuthentication().get_user(token)
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(str(user.id), str(self.user.id))
+
+    def test_inactive_claim_is_rejected(self):
+        self.user.is_active = False
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        with self.assertRaises(AuthenticationFailed):
+            StatelessJWTAuthentication().get_user(token)
+
+    def test_token_without_active_claim_checks_the_database(self):
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        del token['is_active']
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            StatelessJWTAuthentication().get_user(token)
+
+    def test_profile_serves_claims_in_the_api_datetime_format(self):
+        token = UserClaimsRefreshToken.for_user(self.user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], self.user.email)
+        self.assertEqual(response.data['first_name'], 'Grace')
+        self.assertEqual(
+            response.data['created_at'],
+            serializers.DateTimeField().to_representation(self.user.created_at)
+        )
+        self.assertTrue(response.data['updated_at'].endswith('Z'))
+
+    def test_refresh_issues_current_claims(self):
+        refresh = UserClaimsRefreshToken.for_user(self.user)
+        self.user.first_name = 'Ada'
+        self.user.is_verified = True
+        self.user.save()
+
+        serializer = UserClaimsTokenRefreshSerializer(data={'refresh': str(refresh)})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        access = AccessToken(serializer.validated_data['access'])
+        self.assertEqual(access['first_name'], 'Ada')
+        self.assertTrue(access['is_verified'])
+
+    def test_refresh_is_refused_for_inactive_user(self):
+        refresh = UserClaimsRefreshToken.for_user(self.user)
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        serializer = UserClaimsTokenRefreshSerializer(data={'refresh': str(refresh)})
+        with self.assertRaises(AuthenticationFailed):
+            serializer.is_valid()
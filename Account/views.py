@@ -1,12 +1,17 @@
+import logging
+
 from rest_framework import status, permissions
-from rest_framework.decorators import api_view, permission_classes, throttle_classes 
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, authentication_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
-from django.contrib.auth import authenticate
+from django.db import connection, transaction
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
-from .models import CustomUser, VerificationToken, PasswordResetToken
+from .models import (
+    CustomUser, VerificationToken, PasswordResetToken, generate_token, match_token
+)
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
@@ -16,11 +21,54 @@ from .serializers import (
     LogoutSerializer,
     EmailResendSerializer
 )
-from django.core.mail import send_mail
-from django.conf import settings
+from .tasks import send_registration_email, send_verification_email, send_password_reset_email
+from .authentication import StatelessJWTAuthentication, UserClaimsRefreshToken
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+logger = logging.getLogger(__name__)
+
+RESEND_COOLDOWN_CACHE_KEY = 'resend_verify_cool:{}'
+RESEND_COOLDOWN = timedelta(minutes=5)
+VERIFY_TTL = timedelta(hours=24)
+RESET_TTL = timedelta(hours=1)
+
+
+def blacklist_outstanding_tokens(user):
+    """Blacklist every outstanding token of a user with one INSERT ... SELECT"""
+    blacklisted = BlacklistedToken._meta
+    outstanding = OutstandingToken._meta
+    now = blacklisted.get_field('blacklisted_at').get_db_prep_value(timezone.now(), connection)
+    user_id = outstanding.get_field('user').get_db_prep_value(user.pk, connection)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {blacklisted.db_table} (token_id, blacklisted_at)
+            SELECT o.id, %s FROM {outstanding.db_table} o
+            LEFT JOIN {blacklisted.db_table} b ON b.token_id = o.id
+            WHERE o.user_id = %s AND b.token_id IS NULL
+            """,
+            [now, user_id]
+        )
+
+
+def start_resend_cooldown(email, now):
+    """Open the resend cooldown window for an email; the cached value is its deadline"""
+    cache.set(
+        RESEND_COOLDOWN_CACHE_KEY.format(email),
+        (now + RESEND_COOLDOWN).timestamp(),
+        int(RESEND_COOLDOWN.total_seconds())
+    )
+
+
+def resend_cooldown_remaining(email, now):
+    """Seconds left in the resend cooldown for an email, 0 when none is active"""
+    deadline = cache.get(RESEND_COOLDOWN_CACHE_KEY.format(email))
+    if deadline is None:
+        return 0
+    return max(0, int(deadline - now.timestamp()))
+
+
 @swagger_auto_schema(methods=['POST'], request_body=UserRegistrationSerializer)
 @api_view(['POST'])
 @throttle_classes([UserRateThrottle, AnonRateThrottle])
@@ -28,28 +76,21 @@ from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 def register(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
-        user = serializer.save()
-        
-        expires_at = timezone.now() + timedelta(hours=24)
-        verification_token = VerificationToken.objects.create(
-            user=user,
-            expires_at=expires_at
-        )
-        
-        # Send verification email
-        verification_url = f"http://localhost:5173/verify-email/{verification_token.token}/"
-        send_mail(
-            'Verify Your Account',
-            f"""
-            Hello {user.email},
-            Welcome to Scenario Forge! Please verify your email address to complete your registration.
-            Click the link to verify your account: {verification_url}
-            Thank you for joining us!
-            """,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
+        now = timezone.now()
+        with transaction.atomic():
+            user = serializer.save()
+            
+            expires_at = now + VERIFY_TTL
+            raw_token, token_fields = generate_token()
+            VerificationToken.objects.create(
+                user=user,
+                expires_at=expires_at,
+                **token_fields
+            )
+            
+            # Send verification email once the user and token are committed
+            transaction.on_commit(lambda: send_registration_email.delay(user.email, raw_token))
+        start_resend_cooldown(user.email, now)
         
         return Response({
             "message": "User registered successfully. Please check your email for verification.",
@@ -71,7 +112,16 @@ def login(request):
         email = serializer.validated_data['email']
         password = serializer.validated_data['password']
         
-        user = authenticate(request, email=email, password=password)
+        # Single lookup by natural key instead of walking the auth backend chain
+        try:
+            user = CustomUser._default_manager.get_by_natural_key(email)
+        except CustomUser.DoesNotExist:
+            # Run the hasher anyway so unknown emails take as long as bad passwords
+            CustomUser().set_password(password)
+            user = None
+        
+        if user is not None and (not user.check_password(password) or not user.is_active):
+            user = None
         
         if user is not None:
             if not user.is_verified:
@@ -80,7 +130,7 @@ def login(request):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            refresh = RefreshToken.for_user(user)
+            refresh = UserClaimsRefreshToken.for_user(user)
             
             return Response({
                 "access": str(refresh.access_token),
@@ -124,29 +174,34 @@ def logout(request):
 @throttle_classes([UserRateThrottle, AnonRateThrottle])
 @permission_classes([permissions.AllowAny])
 def verify_email(request, token):
-    try:
-        verification_token = VerificationToken.objects.get(token=token)
-        
-        if verification_token.is_expired():
+    now = timezone.now()
+    # Prefix lookup and expiry check in one query; the user row itself is never loaded
+    verification_token = match_token(
+        VerificationToken.objects.only('id', 'user_id', 'token_hash').filter(expires_at__gt=now),
+        token
+    )
+    
+    if verification_token is None:
+        # Only on failure: tell an expired token apart from an unknown one
+        if match_token(VerificationToken.objects.only('id', 'token_hash'), token):
             return Response(
                 {"error": "Verification token has expired"},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        user = verification_token.user
-        user.is_verified = True
-        user.save()
-        
-        # Delete the used token
-        verification_token.delete()
-        
-        return Response({"message": "Email verified successfully"}, status=status.HTTP_200_OK)
-    
-    except VerificationToken.DoesNotExist:
         return Response(
             {"error": "Invalid verification token"},
             status=status.HTTP_400_BAD_REQUEST
         )
+    
+    CustomUser.objects.filter(pk=verification_token.user_id).update(
+        is_verified=True,
+        updated_at=now
+    )
+    
+    # Delete the used token
+    VerificationToken.objects.filter(pk=verification_token.pk).delete()
+    
+    return Response({"message": "Email verified successfully"}, status=status.HTTP_200_OK)
 
 
 @swagger_auto_schema(methods=['POST'], request_body=ForgotPasswordSerializer)
@@ -160,32 +215,17 @@ def forgot_password(request):
         
         try:
             user = CustomUser.objects.get(email=email)
-            expires_at = timezone.now() + timedelta(hours=1)
-            
-            # Delete any existing reset tokens for this user
-            PasswordResetToken.objects.filter(user=user).delete()
+            expires_at = timezone.now() + RESET_TTL
             
-            # Create new reset token
-            reset_token = PasswordResetToken.objects.create(
+            # Replace any existing reset token for this user with a fresh one
+            raw_token, token_fields = generate_token()
+            PasswordResetToken.objects.update_or_create(
                 user=user,
-                expires_at=expires_at
+                defaults={**token_fields, 'expires_at': expires_at}
             )
             
             # Send reset email
-            reset_url = f"http://localhost:5173/reset-password/{reset_token.token}/"
-            send_mail(
-                'Reset Your Password',
-                f"""
-                Hello {user.email},
-                We received a request to reset your password.
-                If you did not make this request, please ignore this email.
-                Click the link to reset your password: {reset_url}
-                Thank you.
-                """,
-                settings.DEFAULT_FROM_EMAIL,
-                [user.email],
-                fail_silently=False,
-            )
+            send_password_reset_email.delay(user.email, raw_token)
             
             return Response({
                 "message": "Password reset email sent successfully"
@@ -209,36 +249,38 @@ def reset_password(request):
         token = serializer.validated_data['token']
         new_password = serializer.validated_data['new_password']
         
-        try:
-            reset_token = PasswordResetToken.objects.get(token=token)
-            
-            if reset_token.is_expired():
+        # Prefix lookup and expiry check in one query
+        reset_token = match_token(
+            PasswordResetToken.objects.select_related('user').filter(expires_at__gt=timezone.now()),
+            token
+        )
+        
+        if reset_token is None:
+            # Only on failure: tell an expired token apart from an unknown one
+            if match_token(PasswordResetToken.objects.only('id', 'token_hash'), token):
                 return Response(
                     {"error": "Password reset token has expired"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            user = reset_token.user
-            user.set_password(new_password)
-            user.save()
+            return Response(
+                {"error": "Invalid reset token"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        user = reset_token.user
+        user.set_password(new_password)
+        with transaction.atomic():
+            user.save(update_fields=['password', 'updated_at'])
             
             # Delete the used token
             reset_token.delete()
             
             # Blacklist all existing tokens for this user
-            tokens = OutstandingToken.objects.filter(user=user)
-            for token in tokens:
-                BlacklistedToken.objects.get_or_create(token=token)
-            
-            return Response({
-                "message": "Password reset successfully"
-            }, status=status.HTTP_200_OK)
+            blacklist_outstanding_tokens(user)
         
-        except PasswordResetToken.DoesNotExist:
-            return Response(
-                {"error": "Invalid reset token"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return Response({
+            "message": "Password reset successfully"
+        }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -258,15 +300,14 @@ def change_password(request):
             )
         
         user.set_password(serializer.validated_data['new_password'])
-        user.save()
-        
-        # Blacklist all existing tokens
-        tokens = OutstandingToken.objects.filter(user=user)
-        for token in tokens:
-            BlacklistedToken.objects.get_or_create(token=token)
+        with transaction.atomic():
+            user.save(update_fields=['password', 'updated_at'])
+            
+            # Blacklist all existing tokens
+            blacklist_outstanding_tokens(user)
         
         # Generate new tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)
         
         return Response({
             "message": "Password changed successfully",
@@ -278,17 +319,29 @@ def change_password(request):
 
 @api_view(['GET'])
 @throttle_classes([UserRateThrottle, AnonRateThrottle])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([permissions.IsAuthenticated])
 def profile(request):
-    user = request.user
+    claims = request.auth
+    if 'first_name' not in claims:
+        # Tokens issued before profile claims were added: fall back to the DB
+        user = CustomUser.objects.get(pk=request.user.id)
+        claims = {
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "is_verified": user.is_verified,
+            "created_at": user.created_at,
+            "updated_at": user.updated_at
+        }
     return Response({
-        "id": user.id,
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "is_verified": user.is_verified,
-        "created_at": user.created_at,
-        "updated_at": user.updated_at
+        "id": request.user.id,
+        "email": claims["email"],
+        "first_name": claims["first_name"],
+        "last_name": claims["last_name"],
+        "is_verified": claims["is_verified"],
+        "created_at": claims["created_at"],
+        "updated_at": claims["updated_at"]
     }, status=status.HTTP_200_OK)
 
 
@@ -302,14 +355,18 @@ def resend_verification_email(request):
     """
     serializer = EmailResendSerializer(data=request.data)
     if not serializer.is_valid():
-        return Response(serializer.errors)
-    validated_data = serializer.validated_data
-    email = validated_data['email']
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    email = serializer.validated_data['email']
     
-    if not email:
+    # Serve repeat requests inside the cooldown window from the cache
+    now = timezone.now()
+    remaining_seconds = resend_cooldown_remaining(email, now)
+    if remaining_seconds:
         return Response(
-            {"error": "Email is required"},
-            status=status.HTTP_400_BAD_REQUEST
+            {
+                "error": f"Please wait {remaining_seconds} seconds before requesting another verification email"
+            },
+            status=status.HTTP_429_TOO_MANY_REQUESTS
         )
     
     try:
@@ -322,66 +379,29 @@ def resend_verification_email(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check for existing non-expired token
-        existing_token = VerificationToken.objects.filter(user=user).first()
-        
-        if existing_token:
-            # Check if the existing token was created recently (within last 5 minutes)
-            time_since_creation = timezone.now() - existing_token.created_at
-            if time_since_creation < timedelta(minutes=5):
-                remaining_seconds = (timedelta(minutes=5) - time_since_creation).seconds
-                return Response(
-                    {
-                        "error": f"Please wait {remaining_seconds} seconds before requesting another verification email"
-                    },
-                    status=status.HTTP_429_TOO_MANY_REQUESTS
-                )
-            
-            # Delete old token if it exists
-            existing_token.delete()
-        
-        # Create new verification token
-        expires_at = timezone.now() + timedelta(hours=24)
-        verification_token = VerificationToken.objects.create(
+        # Replace any existing verification token with a fresh one
+        raw_token, token_fields = generate_token()
+        VerificationToken.objects.update_or_create(
             user=user,
-            expires_at=expires_at
+            defaults={
+                **token_fields,
+                'created_at': now,
+                'expires_at': now + VERIFY_TTL
+            }
         )
         
         # Send verification email
-        verification_url = f"http://localhost:5173/verify-email/{verification_token.token}/"
-        
         try:
-            send_mail(
-                'Verify Your Account - Scenario Forge',
-                f"""
-Hello {user.first_name or user.email},
-
-Thank you for registering with Scenario Forge!
-
-Please verify your email address to complete your registration and start managing your risks today.
-
-Click the link below to verify your account:
-{verification_url}
-
-This link will expire in 24 hours.
-
-If you didn't create an account with Scenario Forge, please ignore this email.
-
-Best regards,
-The Scenario Forge Team
-                """,
-                settings.DEFAULT_FROM_EMAIL,
-                [user.email],
-                fail_silently=False,
-            )
+            send_verification_email.delay(user.email, user.first_name, raw_token)
+            start_resend_cooldown(user.email, now)
             
             return Response({
                 "message": "Verification email sent successfully. Please check your inbox."
             }, status=status.HTTP_200_OK)
             
-        except Exception as e:
+        except Exception:
             # Log the error but don't expose details to user
-            print(f"Email sending failed: {str(e)}")
+            logger.exception("Verification email queueing failed")
             return Response(
                 {"error": "Failed to send verification email. Please try again later."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     'django_filters',
     'drf_yasg',
     'django_extensions',
+    'cachalot',
     'Account',
     'core',
     'vendors',
@@ -97,6 +98,34 @@ DATABASES = {
     }
 }
 
+# Redis when REDIS_URL is set (production); otherwise a per-process
+# in-memory cache, so development and tests need no Redis server.
+# A Redis outage is treated as a cache miss rather than an error.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.FailSafeRedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# ORM query cache (django-cachalot), limited to read-mostly tables;
+# write-heavy tables would only churn invalidations
+CACHALOT_ONLY_CACHABLE_TABLES = frozenset((
+    'assessment_questions',
+    'assessment_templates',
+    'template_questions',
+))
+# Bounds how long a result can outlive an invalidation lost to a cache outage
+CACHALOT_TIMEOUT = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -145,7 +174,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'Account.authentication.ProfileJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -198,6 +227,8 @@ SIMPLE_JWT = {
     
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_OBTAIN_SERIALIZER': 'Account.serializers.UserClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'Account.serializers.UserClaimsTokenRefreshSerializer',
 }
 
 
@@ -205,6 +236,19 @@ SIMPLE_JWT = {
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'webmaster@localhost'
 
+# Celery (transactional emails are sent from the worker, not the request cycle)
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'purge-expired-tokens': {
+        'task': 'Account.tasks.purge_expired_tokens',
+        'schedule': timedelta(hours=1),
+    },
+}
+
 IS_DEVELOPMENT = DEBUG
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SECURE_SSL_REDIRECT = not IS_DEVELOPMENT  
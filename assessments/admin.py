@@ -4,6 +4,7 @@ from .models import VendorAssessment, AssessmentQuestion, AssessmentTemplate
 @admin.register(VendorAssessment)
 class VendorAssessmentAdmin(admin.ModelAdmin):
     list_display = ['vendor', 'assessment_date', 'status', 'overall_score', 'assessed_by']
+    list_select_related = ['vendor', 'assessed_by']
     list_filter = ['status', 'assessment_type', 'assessment_date']
     search_fields = ['vendor__name']
 
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-15 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vendorassessment',
+            name='vendor_asse_status_7abea1_idx',
+        ),
+        migrations.AddIndex(
+            model_name='vendorassessment',
+            index=models.Index(fields=['-assessment_date'], name='va_date_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='vendorassessment',
+            index=models.Index(fields=['status', '-assessment_date'], include=('vendor', 'overall_score'), name='va_status_date_cov'),
+        ),
+    ]
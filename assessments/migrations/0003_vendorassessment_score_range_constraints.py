@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-15 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_vendorassessment_date_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('access_control_score__gte', 0), ('access_control_score__lte', 100)), name='va_access_control_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('data_protection_score__gte', 0), ('data_protection_score__lte', 100)), name='va_data_protection_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('network_security_score__gte', 0), ('network_security_score__lte', 100)), name='va_network_security_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('incident_response_score__gte', 0), ('incident_response_score__lte', 100)), name='va_incident_response_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('vulnerability_management_score__gte', 0), ('vulnerability_management_score__lte', 100)), name='va_vulnerability_management_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('business_continuity_score__gte', 0), ('business_continuity_score__lte', 100)), name='va_business_continuity_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('security_governance_score__gte', 0), ('security_governance_score__lte', 100)), name='va_security_governance_score_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='vendorassessment',
+            constraint=models.CheckConstraint(check=models.Q(('overall_score__gte', 0), ('overall_score__lte', 100)), name='va_overall_score_range'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-16 00:14
+
+import assessments.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_vendorassessment_score_range_constraints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assessmentevidence',
+            name='file',
+            field=models.FileField(help_text='Upload supporting documentation', upload_to=assessments.models.evidence_upload_path),
+        ),
+    ]
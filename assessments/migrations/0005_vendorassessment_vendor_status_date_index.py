@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-16 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0004_alter_assessmentevidence_file'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendorassessment',
+            index=models.Index(fields=['vendor', 'status', '-assessment_date'], name='va_vendor_status_date'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0005_vendorassessment_vendor_status_date_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vendorassessment',
+            name='va_status_date_cov',
+        ),
+        migrations.AddIndex(
+            model_name='vendorassessment',
+            index=models.Index(fields=['status', '-assessment_date'], name='va_status_date'),
+        ),
+    ]
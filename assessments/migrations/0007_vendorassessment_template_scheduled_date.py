@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-16 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0006_vendorassessment_status_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendorassessment',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assessments', to='assessments.assessmenttemplate'),
+        ),
+        migrations.AddField(
+            model_name='vendorassessment',
+            name='scheduled_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -1,11 +1,30 @@
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
-from vendors.models import Vendor
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from vendors.models import Vendor, vendor_organization_id
 import uuid
 
+ASSESSMENT_SUMMARY_CACHE_KEY = 'assessment_summary:{}'
+ASSESSMENT_SUMMARY_CACHE_TTL = 300
+
 class VendorAssessment(models.Model):
     """Security assessment questionnaire responses"""
+    ASSESSMENT_TYPE_CHOICES = [
+        ('initial', 'Initial Assessment'),
+        ('annual', 'Annual Review'),
+        ('triggered', 'Triggered Assessment'),
+        ('incident_followup', 'Incident Follow-up'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('approved', 'Approved'),
+    ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     vendor = models.ForeignKey(
@@ -24,14 +43,18 @@ class VendorAssessment(models.Model):
     assessment_date = models.DateField(auto_now_add=True)
     assessment_type = models.CharField(
         max_length=50,
-        choices=[
-            ('initial', 'Initial Assessment'),
-            ('annual', 'Annual Review'),
-            ('triggered', 'Triggered Assessment'),
-            ('incident_followup', 'Incident Follow-up'),
-        ],
+        choices=ASSESSMENT_TYPE_CHOICES,
         default='initial'
     )
+    # Set when the assessment is scheduled in bulk from a template
+    template = models.ForeignKey(
+        'AssessmentTemplate',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assessments'
+    )
+    scheduled_date = models.DateField(null=True, blank=True)
     
     # Questionnaire responses (flexible JSON structure)
     responses = models.JSONField(
@@ -88,12 +111,7 @@ class VendorAssessment(models.Model):
     # Assessment status
     status = models.CharField(
         max_length=20,
-        choices=[
-            ('draft', 'Draft'),
-            ('in_progress', 'In Progress'),
-            ('completed', 'Completed'),
-            ('approved', 'Approved'),
-        ],
+        choices=STATUS_CHOICES,
         default='draft'
     )
     
@@ -125,33 +143,52 @@ class VendorAssessment(models.Model):
         verbose_name_plural = 'Vendor Assessments'
         indexes = [
             models.Index(fields=['vendor', 'assessment_date']),
-            models.Index(fields=['status']),
+            # Per-vendor list/compare filtered by status, newest first
+            models.Index(
+                fields=['vendor', 'status', '-assessment_date'],
+                name='va_vendor_status_date'
+            ),
+            # Default list ordering without a vendor filter
+            models.Index(fields=['-assessment_date'], name='va_date_desc'),
+            # Status breakdowns, newest first
+            models.Index(fields=['status', '-assessment_date'], name='va_status_date'),
+        ]
+        # Scores are 0-100; enforced by the database as well as the field validators
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(**{f'{field}__gte': 0, f'{field}__lte': 100}),
+                name=f'va_{field}_range'
+            )
+            for field in (
+                'access_control_score', 'data_protection_score',
+                'network_security_score', 'incident_response_score',
+                'vulnerability_management_score', 'business_continuity_score',
+                'security_governance_score', 'overall_score',
+            )
         ]
     
+    # Category score weights, based on typical security assessment priorities
+    SCORE_WEIGHTS = (
+        ('access_control_score', 0.20),
+        ('data_protection_score', 0.20),
+        ('network_security_score', 0.15),
+        ('incident_response_score', 0.15),
+        ('vulnerability_management_score', 0.15),
+        ('business_continuity_score', 0.10),
+        ('security_governance_score', 0.05),
+    )
+    
     def __str__(self):
         return f"Assessment for {self.vendor.name} on {self.assessment_date}"
     
-    def calculate_overall_score(self):
-        """
-        Calculate overall assessment score from category scores
-        Weights based on typical security assessment priorities
-        """
-        self.overall_score = int(
-            self.access_control_score * 0.20 +
-            self.data_protection_score * 0.20 +
-            self.network_security_score * 0.15 +
-            self.incident_response_score * 0.15 +
-            self.vulnerability_management_score * 0.15 +
-            self.business_continuity_score * 0.10 +
-            self.security_governance_score * 0.05
-        )
-        self.save(update_fields=['overall_score'])
-        
-        # Update vendor's security posture score
+    def compute_overall_score(self):
+        """Calculate overall assessment score from category scores, without saving"""
+        return int(sum(getattr(self, field) * weight for field, weight in self.SCORE_WEIGHTS))
+    
+    def update_vendor_posture(self):
+        """Update vendor's security posture score from this assessment"""
         self.vendor.security_posture_score = self.overall_score
         self.vendor.calculate_risk_score()
-        
-        return self.overall_score
     
     def get_score_breakdown(self):
         """Return dictionary of all category scores"""
@@ -324,6 +361,12 @@ class TemplateQuestion(models.Model):
         unique_together = ['template', 'question']
 
 
+def evidence_upload_path(instance, filename):
+    """Shard evidence uploads into 256x256 directories keyed on the evidence id"""
+    uid = instance.id.hex
+    return f'assessment_evidence/{uid[:2]}/{uid[2:4]}/{uid}_{filename}'
+
+
 class AssessmentEvidence(models.Model):
     """
     Supporting evidence/documentation for assessment responses
@@ -349,7 +392,7 @@ class AssessmentEvidence(models.Model):
     
     # File attachment
     file = models.FileField(
-        upload_to='assessment_evidence/',
+        upload_to=evidence_upload_path,
         help_text="Upload supporting documentation"
     )
     
@@ -371,4 +414,23 @@ class AssessmentEvidence(models.Model):
         verbose_name_plural = 'Assessment Evidence'
     
     def __str__(self):
-        return f"{self.title} - {self.assessment}"
\ No newline at end of file
+        return f"{self.title} - {self.assessment}"
+
+
+def clear_assessment_summary_cache(organization_id):
+    """Drop the cached assessment summary of an organization"""
+    if organization_id is None:
+        return
+    cache.delete(ASSESSMENT_SUMMARY_CACHE_KEY.format(organization_id))
+
+
+# Only post_save is hooked, to keep Django's fast cascade delete; the delete
+# views and bulk writes call clear_assessment_summary_cache themselves
+@receiver(post_save, sender=VendorAssessment)
+@receiver(post_save, sender=Vendor)
+def clear_assessment_summary_cache_on_save(sender, instance, **kwargs):
+    """Drop the cached assessment summary of the organization whose data changed"""
+    if sender is Vendor:
+        clear_assessment_summary_cache(instance.organization_id)
+    else:
+        clear_assessment_summary_cache(vendor_organization_id(instance))
@@ -1,21 +1,63 @@
 from rest_framework import serializers
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat, Trim
 from .models import (
     VendorAssessment, AssessmentQuestion, AssessmentTemplate,
     TemplateQuestion, AssessmentEvidence
 )
 from  django.core.validators import FileExtensionValidator
+from django.utils.functional import cached_property
 
+# Choice labels resolved once, instead of a get_FOO_display() call per serialized row
+STATUS_DISPLAY = dict(VendorAssessment.STATUS_CHOICES)
+ASSESSMENT_TYPE_DISPLAY = dict(VendorAssessment.ASSESSMENT_TYPE_CHOICES)
+EVIDENCE_TYPE_DISPLAY = dict(AssessmentEvidence.EVIDENCE_TYPES)
+CATEGORY_DISPLAY = dict(AssessmentQuestion.CATEGORY_CHOICES)
+FRAMEWORK_DISPLAY = dict(AssessmentQuestion.FRAMEWORK_CHOICES)
+RESPONSE_TYPE_DISPLAY = dict(AssessmentQuestion.RESPONSE_TYPE_CHOICES)
 
-class AssessmentEvidenceSerializer(serializers.ModelSerializer):
+
+class CachedReadableFieldsMixin:
+    """
+    Serializer mixin that resolves its readable fields once; a many=True
+    list reuses the same child, so the field walk is not repeated per row
+    """
+    
+    @cached_property
+    def _readable_fields(self):
+        return list(super()._readable_fields)
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """ListSerializer that saves a posted list with bulk_create"""
+    
+    def create(self, validated_data):
+        """Insert all rows in batched INSERTs instead of one save() per row"""
+        model = self.child.Meta.model
+        return model.objects.bulk_create(
+            [model(**attrs) for attrs in validated_data],
+            batch_size=500
+        )
+
+
+class ChoiceDisplayField(serializers.ReadOnlyField):
+    """Read-only label for a choice value, looked up in a precomputed dict"""
+    
+    def __init__(self, choices_display, **kwargs):
+        self.choices_display = choices_display
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        return self.choices_display.get(value, value)
+
+
+class AssessmentEvidenceSerializer(CachedReadableFieldsMixin, serializers.ModelSerializer):
     """Serializer for AssessmentEvidence with file validation"""
     uploaded_by_name = serializers.CharField(
         source='uploaded_by.get_full_name',
         read_only=True
     )
-    evidence_type_display = serializers.CharField(
-        source='get_evidence_type_display',
-        read_only=True
-    )
+    evidence_type_display = ChoiceDisplayField(EVIDENCE_TYPE_DISPLAY, source='evidence_type')
     file = serializers.FileField(
         validators=[
             FileExtensionValidator(
@@ -54,23 +96,15 @@ class AssessmentEvidenceSerializer(serializers.ModelSerializer):
         return value
 
 
-class AssessmentQuestionSerializer(serializers.ModelSerializer):
+class AssessmentQuestionSerializer(CachedReadableFieldsMixin, serializers.ModelSerializer):
     """Serializer for AssessmentQuestion"""
-    category_display = serializers.CharField(
-        source='get_category_display',
-        read_only=True
-    )
-    framework_display = serializers.CharField(
-        source='get_framework_display',
-        read_only=True
-    )
-    response_type_display = serializers.CharField(
-        source='get_response_type_display',
-        read_only=True
-    )
+    category_display = ChoiceDisplayField(CATEGORY_DISPLAY, source='category')
+    framework_display = ChoiceDisplayField(FRAMEWORK_DISPLAY, source='framework')
+    response_type_display = ChoiceDisplayField(RESPONSE_TYPE_DISPLAY, source='response_type')
     
     class Meta:
         model = AssessmentQuestion
+        list_serializer_class = BulkCreateListSerializer
         fields = [
             'id', 'category', 'category_display', 'framework',
             'framework_display', 'question_text', 'guidance',
@@ -98,10 +132,7 @@ class TemplateQuestionSerializer(serializers.ModelSerializer):
 class AssessmentTemplateSerializer(serializers.ModelSerializer):
     """Serializer for AssessmentTemplate"""
     question_count = serializers.SerializerMethodField()
-    framework_display = serializers.CharField(
-        source='get_framework_display',
-        read_only=True
-    )
+    framework_display = ChoiceDisplayField(FRAMEWORK_DISPLAY, source='framework')
     
     class Meta:
         model = AssessmentTemplate
@@ -113,7 +144,11 @@ class AssessmentTemplateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_question_count(self, obj):
-        return obj.get_question_count()
+        # List/detail querysets annotate the count; only fall back to a COUNT query without it
+        question_count = getattr(obj, 'question_count', None)
+        if question_count is None:
+            return obj.get_question_count()
+        return question_count
 
 
 class AssessmentTemplateDetailSerializer(AssessmentTemplateSerializer):
@@ -128,33 +163,56 @@ class AssessmentTemplateDetailSerializer(AssessmentTemplateSerializer):
         fields = AssessmentTemplateSerializer.Meta.fields + ['template_questions']
 
 
-class VendorAssessmentListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for assessment lists"""
-    vendor_name = serializers.CharField(source='vendor.name', read_only=True)
-    assessed_by_name = serializers.SerializerMethodField()
-    status_display = serializers.CharField(
-        source='get_status_display',
-        read_only=True
-    )
-    assessment_type_display = serializers.CharField(
-        source='get_assessment_type_display',
-        read_only=True
+class VendorAssessmentListDictSerializer(serializers.Serializer):
+    """Read-only list serializer over VendorAssessment.objects.values() rows"""
+    VALUES_FIELDS = (
+        'id', 'vendor_id', 'vendor__name', 'assessment_date',
+        'assessment_type', 'status', 'overall_score', 'assessed_by_id',
+        'created_at'
     )
+    # Built by the database; '' for an assessor with blank names
+    VALUES_EXPRESSIONS = {
+        'assessed_by_name': Trim(Concat(
+            'assessed_by__first_name', Value(' '), 'assessed_by__last_name',
+            output_field=CharField()
+        )),
+    }
     
-    class Meta:
-        model = VendorAssessment
-        fields = [
-            'id', 'vendor', 'vendor_name', 'assessment_date',
-            'assessment_type', 'assessment_type_display',
-            'status', 'status_display', 'overall_score',
-            'assessed_by', 'assessed_by_name', 'created_at'
-        ]
-        read_only_fields = fields
+    id = serializers.UUIDField(read_only=True)
+    vendor = serializers.UUIDField(source='vendor_id', read_only=True)
+    vendor_name = serializers.CharField(source='vendor__name', read_only=True)
+    assessment_date = serializers.DateField(read_only=True)
+    assessment_type = serializers.CharField(read_only=True)
+    assessment_type_display = ChoiceDisplayField(ASSESSMENT_TYPE_DISPLAY, source='assessment_type')
+    status = serializers.CharField(read_only=True)
+    status_display = ChoiceDisplayField(STATUS_DISPLAY, source='status')
+    overall_score = serializers.IntegerField(read_only=True)
+    assessed_by = serializers.UUIDField(source='assessed_by_id', read_only=True)
+    assessed_by_name = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
     
-    def get_assessed_by_name(self, obj):
-        if obj.assessed_by:
-            return f"{obj.assessed_by.first_name} {obj.assessed_by.last_name}".strip()
-        return None
+    def to_representation(self, row):
+        """
+        Build the output dict directly instead of walking the declared fields
+        for every row; the fields above still document the shape
+        """
+        assessed_by_id = row['assessed_by_id']
+        return {
+            'id': str(row['id']),
+            'vendor': str(row['vendor_id']),
+            'vendor_name': row['vendor__name'],
+            'assessment_date': row['assessment_date'].isoformat(),
+            'assessment_type': row['assessment_type'],
+            'assessment_type_display': ASSESSMENT_TYPE_DISPLAY.get(row['assessment_type'], row['assessment_type']),
+            'status': row['status'],
+            'status_display': STATUS_DISPLAY.get(row['status'], row['status']),
+            'overall_score': row['overall_score'],
+            'assessed_by': str(assessed_by_id) if assessed_by_id else None,
+            # Concat turns a missing assessor's NULL names into ''; keep None for no assessor
+            'assessed_by_name': row['assessed_by_name'] if assessed_by_id else None,
+            # Timezone conversion and formatting as DRF does it
+            'created_at': self.fields['created_at'].to_representation(row['created_at']),
+        }
 
 
 class VendorAssessmentDetailSerializer(serializers.ModelSerializer):
@@ -164,21 +222,15 @@ class VendorAssessmentDetailSerializer(serializers.ModelSerializer):
     evidence = AssessmentEvidenceSerializer(many=True, read_only=True)
     score_breakdown = serializers.SerializerMethodField()
     
-    status_display = serializers.CharField(
-        source='get_status_display',
-        read_only=True
-    )
-    assessment_type_display = serializers.CharField(
-        source='get_assessment_type_display',
-        read_only=True
-    )
+    status_display = ChoiceDisplayField(STATUS_DISPLAY, source='status')
+    assessment_type_display = ChoiceDisplayField(ASSESSMENT_TYPE_DISPLAY, source='assessment_type')
     
     class Meta:
         model = VendorAssessment
         fields = [
             'id', 'vendor', 'vendor_name', 'assessed_by', 'assessed_by_name',
             'assessment_date', 'assessment_type', 'assessment_type_display',
-            'responses', 'access_control_score', 'data_protection_score',
+            'template', 'scheduled_date', 'responses', 'access_control_score', 'data_protection_score',
             'network_security_score', 'incident_response_score',
             'vulnerability_management_score', 'business_continuity_score',
             'security_governance_score', 'overall_score', 'score_breakdown',
@@ -188,7 +240,8 @@ class VendorAssessmentDetailSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'assessment_date', 'overall_score', 'created_at', 'updated_at'
+            'id', 'assessment_date', 'template', 'scheduled_date',
+            'overall_score', 'created_at', 'updated_at'
         ]
     
     def get_assessed_by_name(self, obj):
@@ -216,21 +269,7 @@ class VendorAssessmentCreateUpdateSerializer(serializers.ModelSerializer):
     
     def validate(self, data):
         """Validate assessment data"""
-        # Ensure all scores are between 0-100
-        score_fields = [
-            'access_control_score', 'data_protection_score',
-            'network_security_score', 'incident_response_score',
-            'vulnerability_management_score', 'business_continuity_score',
-            'security_governance_score'
-        ]
-        
-        for field in score_fields:
-            if field in data:
-                score = data[field]
-                if not 0 <= score <= 100:
-                    raise serializers.ValidationError({
-                        field: f"Score must be between 0 and 100"
-                    })
+        # Score ranges are checked by the fields (from the model validators) and the DB constraints
         
         # If requires followup, ensure followup_date is set
         if data.get('requires_followup') and not data.get('followup_date'):
@@ -246,17 +285,29 @@ class VendorAssessmentCreateUpdateSerializer(serializers.ModelSerializer):
         if request:
             validated_data['assessed_by'] = request.user
         
-        assessment = VendorAssessment.objects.create(**validated_data)
-        assessment.calculate_overall_score()
+        # Score is known before the insert, so the row is written once
+        assessment = VendorAssessment(**validated_data)
+        assessment.overall_score = assessment.compute_overall_score()
+        assessment.save(force_insert=True)
+        assessment.update_vendor_posture()
         
         return assessment
     
     def update(self, instance, validated_data):
         """Update assessment and recalculate score"""
+        score_fields = [field for field, _ in VendorAssessment.SCORE_WEIGHTS]
+        old_scores = tuple(getattr(instance, field) for field in score_fields)
+        
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
+        
+        # Only rescore when a category score actually changed
+        rescore = tuple(getattr(instance, field) for field in score_fields) != old_scores
+        if rescore:
+            instance.overall_score = instance.compute_overall_score()
         instance.save()
-        instance.calculate_overall_score()
+        if rescore:
+            instance.update_vendor_posture()
         
         return instance
 
@@ -295,28 +346,6 @@ class AssessmentTemplateQuestionnaireSerializer(serializers.Serializer):
     total_questions = serializers.IntegerField()
 
 
-class AssessmentSummarySerializer(serializers.Serializer):
-    """Serializer for assessment portfolio summary"""
-    total_assessments = serializers.IntegerField()
-    completed_assessments = serializers.IntegerField()
-    pending_assessments = serializers.IntegerField()
-    
-    average_score = serializers.FloatField()
-    
-    by_status = serializers.DictField(
-        child=serializers.IntegerField()
-    )
-    
-    recent_assessments = VendorAssessmentListSerializer(many=True)
-    vendors_needing_assessment = serializers.ListField(
-        child=serializers.DictField()
-    )
-    
-    score_trends = serializers.ListField(
-        child=serializers.DictField()
-    )
-
-
 class AssessmentApprovalSerializer(serializers.Serializer):
     """Serializer for assessment approval"""
     assessment_id = serializers.UUIDField()
@@ -332,16 +361,45 @@ class BulkAssessmentCreateSerializer(serializers.Serializer):
     )
     template_id = serializers.UUIDField()
     assessment_type = serializers.ChoiceField(
-        choices=VendorAssessment._meta.get_field('assessment_type').choices
+        choices=VendorAssessment.ASSESSMENT_TYPE_CHOICES
     )
     scheduled_date = serializers.DateField(required=False)
+    
+    def validate_vendor_ids(self, value):
+        # One draft per vendor, however often it is listed
+        return list(dict.fromkeys(value))
+    
+    def validate_template_id(self, value):
+        if not AssessmentTemplate.objects.filter(id=value, is_active=True).exists():
+            raise serializers.ValidationError('Assessment template not found')
+        return value
+    
+    def create(self, validated_data):
+        """
+        Create a draft assessment per vendor in batched INSERTs. Drafts are
+        unscored, so vendor posture is left alone until an assessment is scored.
+        """
+        request = self.context.get('request')
+        assessed_by = request.user if request else None
+        
+        assessments = [
+            VendorAssessment(
+                vendor_id=vendor_id,
+                assessment_type=validated_data['assessment_type'],
+                template_id=validated_data['template_id'],
+                scheduled_date=validated_data.get('scheduled_date'),
+                assessed_by=assessed_by
+            )
+            for vendor_id in validated_data['vendor_ids']
+        ]
+        return VendorAssessment.objects.bulk_create(assessments, batch_size=500)
 
 
 class AssessmentScheduleSerializer(serializers.Serializer):
     """Serializer for assessment scheduling"""
     vendor_id = serializers.UUIDField()
     assessment_type = serializers.ChoiceField(
-        choices=VendorAssessment._meta.get_field('assessment_type').choices
+        choices=VendorAssessment.ASSESSMENT_TYPE_CHOICES
     )
     scheduled_date = serializers.DateField()
     assigned_to = serializers.UUIDField(required=False)
@@ -1,3 +1,276 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from Account.models import CustomUser
+from core.models import Organization, DASHBOARD_OVERVIEW_CACHE_KEY
+from vendors.models import Vendor
+from .models import (
+    VendorAssessment, AssessmentEvidence, AssessmentTemplate,
+    ASSESSMENT_SUMMARY_CACHE_KEY
+)
+from .serializers import VendorAssessmentCreateUpdateSerializer
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_vendor(organization, name):
+    return Vendor.objects.create(
+        organization=organization,
+        name=name,
+        industry='Technology',
+        country='US',
+        contact_name='Contact',
+        contact_email='contact@example.com',
+        services_provided='Hosting',
+        contract_start_date=date(2026, 1, 1),
+        contract_end_date=date(2027, 1, 1),
+        contract_value=Decimal('100000.00'),
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AssessmentTestCase(TestCase):
+    """Organization with an admin user and one vendor"""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(
+            name='Acme', industry='Finance', size='Medium', country='US'
+        )
+        self.user = CustomUser.objects.create_user(
+            email='admin@example.com', password='pass12345', first_name='Ada', last_name='Admin'
+        )
+        profile = self.user.profile
+        profile.organization = self.organization
+        profile.role = 'admin'
+        profile.save()
+        self.vendor = create_vendor(self.organization, 'Cloudy')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_assessments(self, count, **kwargs):
+        return [
+            VendorAssessment.objects.create(vendor=self.vendor, assessed_by=self.user, **kwargs)
+            for _ in range(count)
+        ]
+
+    def count_queries(self, url):
+        # A freshly loaded user, so every measured request pays for the same profile lookups
+        self.client.force_authenticate(CustomUser.objects.get(pk=self.user.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+
+class AssessmentQueryCountTests(AssessmentTestCase):
+    """The list and detail endpoints must not issue a query per row"""
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        url = reverse('assessments:assessment-list-create')
+        self.create_assessments(2)
+        few = self.count_queries(url)
+        self.create_assessments(8)
+        many = self.count_queries(url)
+        self.assertEqual(few, many)
+
+    def test_detail_query_count_does_not_grow_with_evidence(self):
+        assessment = self.create_assessments(1)[0]
+        url = reverse('assessments:assessment-detail', args=[assessment.id])
+
+        def add_evidence(count):
+            for i in range(count):
+                AssessmentEvidence.objects.create(
+                    assessment=assessment,
+                    title=f'Evidence {i}',
+                    file=f'evidence/doc-{i}.pdf',
+                    uploaded_by=self.user,
+                )
+
+        add_evidence(1)
+        few = self.count_queries(url)
+        add_evidence(5)
+        many = self.count_queries(url)
+        self.assertEqual(few, many)
+
+
+class AssessmentRescoreTests(AssessmentTestCase):
+    """Updates rescore only when a category score changes"""
+
+    def update(self, assessment, **data):
+        serializer = VendorAssessmentCreateUpdateSerializer(assessment, data=data, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save()
+
+    def test_score_change_rescores(self):
+        assessment = self.create_assessments(1)[0]
+        assessment = self.update(assessment, access_control_score=100, data_protection_score=50)
+        self.assertEqual(assessment.overall_score, 30)
+        assessment.refresh_from_db()
+        self.assertEqual(assessment.overall_score, 30)
+
+    def test_other_field_changes_skip_rescoring(self):
+        assessment = self.create_assessments(1, access_control_score=100)[0]
+        with mock.patch.object(VendorAssessment, 'compute_overall_score') as compute, \
+                mock.patch.object(VendorAssessment, 'update_vendor_posture') as update_posture:
+            self.update(assessment, notes='Reviewed with the vendor')
+        compute.assert_not_called()
+        update_posture.assert_not_called()
+
+
+class AssessmentListRowTests(AssessmentTestCase):
+    """values() rows must serialize the way the model serializer did"""
+
+    def list_rows(self):
+        response = self.client.get(reverse('assessments:assessment-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_rows_carry_vendor_and_assessor_names(self):
+        assessment = self.create_assessments(1, assessment_type='annual')[0]
+        row = self.list_rows()[0]
+        self.assertEqual(row['id'], str(assessment.id))
+        self.assertEqual(row['vendor'], str(self.vendor.id))
+        self.assertEqual(row['vendor_name'], 'Cloudy')
+        self.assertEqual(row['assessed_by'], str(self.user.id))
+        self.assertEqual(row['assessed_by_name'], 'Ada Admin')
+        self.assertEqual(row['status_display'], 'Draft')
+        self.assertEqual(row['assessment_type_display'], 'Annual Review')
+
+    def test_assessor_with_blank_names_gives_empty_string(self):
+        assessor = CustomUser.objects.create_user(
+            email='blank@example.com', password='pass12345', first_name='', last_name=''
+        )
+        VendorAssessment.objects.create(vendor=self.vendor, assessed_by=assessor)
+        self.assertEqual(self.list_rows()[0]['assessed_by_name'], '')
+
+    def test_missing_assessor_gives_none(self):
+        VendorAssessment.objects.create(vendor=self.vendor)
+        row = self.list_rows()[0]
+        self.assertIsNone(row['assessed_by'])
+        self.assertIsNone(row['assessed_by_name'])
+
+
+class BulkAssessmentCreateTests(AssessmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_vendor = create_vendor(self.organization, 'Storagely')
+        self.template = AssessmentTemplate.objects.create(name='Baseline', description='Baseline')
+        self.url = reverse('assessments:bulk-create')
+
+    def post(self, **data):
+        return self.client.post(self.url, {
+            'vendor_ids': [str(self.vendor.id), str(self.other_vendor.id)],
+            'template_id': str(self.template.id),
+            'assessment_type': 'annual',
+            **data
+        }, format='json')
+
+    def test_drafts_keep_template_and_scheduled_date(self):
+        response = self.post(scheduled_date='2026-11-01')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [row['vendor_name'] for row in response.data['assessments']],
+            ['Cloudy', 'Storagely']
+        )
+        assessments = VendorAssessment.objects.filter(vendor__in=[self.vendor, self.other_vendor])
+        self.assertEqual(assessments.count(), 2)
+        for assessment in assessments:
+            self.assertEqual(assessment.template_id, self.template.id)
+            self.assertEqual(assessment.scheduled_date, date(2026, 11, 1))
+            self.assertEqual(assessment.assessment_type, 'annual')
+            self.assertEqual(assessment.status, 'draft')
+            self.assertEqual(assessment.assessed_by, self.user)
+
+    def test_repeated_vendor_gets_one_draft(self):
+        response = self.post(vendor_ids=[str(self.vendor.id), str(self.vendor.id)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(VendorAssessment.objects.filter(vendor=self.vendor).count(), 1)
+
+    def test_unknown_template_is_rejected(self):
+        response = self.post(template_id='00000000-0000-0000-0000-000000000000')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('template_id', response.data)
+
+    def test_other_organizations_vendor_is_rejected(self):
+        other_organization = Organization.objects.create(
+            name='Other', industry='Retail', size='Small', country='US'
+        )
+        foreign_vendor = create_vendor(other_organization, 'Elsewhere')
+        response = self.post(vendor_ids=[str(self.vendor.id), str(foreign_vendor.id)])
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(VendorAssessment.objects.exists())
+
+    def test_vendor_posture_is_left_alone(self):
+        self.vendor.security_posture_score = 80
+        self.vendor.save()
+        before = Vendor.objects.values('security_posture_score', 'overall_risk_score', 'risk_level').get(
+            pk=self.vendor.pk
+        )
+        self.assertEqual(self.post().status_code, 201)
+        after = Vendor.objects.values('security_posture_score', 'overall_risk_score', 'risk_level').get(
+            pk=self.vendor.pk
+        )
+        self.assertEqual(after, before)
+
+    def test_cached_summary_and_dashboard_are_cleared(self):
+        summary_key = ASSESSMENT_SUMMARY_CACHE_KEY.format(self.organization.id)
+        dashboard_key = DASHBOARD_OVERVIEW_CACHE_KEY.format(self.organization.id)
+        cache.set_many({summary_key: {'stale': True}, dashboard_key: {'stale': True}})
+        self.assertEqual(self.post().status_code, 201)
+        self.assertIsNone(cache.get(summary_key))
+        self.assertIsNone(cache.get(dashboard_key))
+
+
+class AssessmentSummaryCacheTests(AssessmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.key = ASSESSMENT_SUMMARY_CACHE_KEY.format(self.organization.id)
+
+    def test_summary_is_cached_until_an_assessment_is_saved(self):
+        url = reverse('assessments:assessment-summary')
+        self.assertEqual(self.client.get(url).data['total_assessments'], 0)
+        self.assertIsNotNone(cache.get(self.key))
+
+        self.create_assessments(1)
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(self.client.get(url).data['total_assessments'], 1)
+
+    def test_summary_payload_shape(self):
+        self.create_assessments(1, status='completed', overall_score=20)
+        data = self.client.get(reverse('assessments:assessment-summary')).data
+        self.assertEqual(set(data), {
+            'total_assessments', 'completed_assessments', 'pending_assessments',
+            'average_score', 'by_status', 'recent_assessments',
+            'vendors_needing_assessment', 'score_trends',
+        })
+        self.assertEqual(data['completed_assessments'], 1)
+        self.assertEqual(data['average_score'], 20)
+        self.assertEqual(data['by_status'], {'completed': 1})
+        self.assertEqual(data['recent_assessments'][0]['vendor_name'], 'Cloudy')
+
+    def test_vendor_save_clears_summary(self):
+        cache.set(self.key, {'stale': True})
+        self.vendor.name = 'Cloudier'
+        self.vendor.save()
+        self.assertIsNone(cache.get(self.key))
+
+    def test_delete_view_clears_summary(self):
+        assessment = self.create_assessments(1)[0]
+        cache.set(self.key, {'stale': True})
+        response = self.client.delete(reverse('assessments:assessment-detail', args=[assessment.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNone(cache.get(self.key))
+
+    def test_no_delete_receivers_on_assessments(self):
+        # A delete receiver would turn off fast cascade deletes of vendors' assessments
+        self.assertFalse(post_delete.has_listeners(VendorAssessment))
@@ -9,6 +9,7 @@ urlpatterns = [
     path('<uuid:assessment_id>/approve/', views.approve_assessment, name='approve-assessment'),
     path('<uuid:assessment_id>/compare/', views.compare_assessments, name='compare-assessments'),
     path('summary/', views.assessment_summary, name='assessment-summary'),
+    path('bulk-create/', views.bulk_create_assessments, name='bulk-create'),
     path('questions/', views.question_list_create, name='question-list-create'),
     path('questionnaire/', views.get_questionnaire_template, name='questionnaire-template'),
     path('templates/', views.template_list_create, name='template-list-create'),
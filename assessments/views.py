@@ -2,24 +2,28 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import FormParser, MultiPartParser, JSONParser
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Avg, Count
+from django.db.models import Q, Avg, Count, OuterRef, Prefetch, Subquery
 from django.utils import timezone
 from datetime import timedelta
-from core.models import UserProfile
+from django.core.cache import cache
 from .models import (
     VendorAssessment, AssessmentQuestion, AssessmentTemplate,
-    TemplateQuestion, AssessmentEvidence
+    TemplateQuestion, AssessmentEvidence,
+    ASSESSMENT_SUMMARY_CACHE_KEY, ASSESSMENT_SUMMARY_CACHE_TTL,
+    clear_assessment_summary_cache
 )
 from vendors.models import Vendor
+from core.models import clear_dashboard_cache
 from .serializers import (
-    VendorAssessmentListSerializer, VendorAssessmentDetailSerializer,
+    VendorAssessmentListDictSerializer, VendorAssessmentDetailSerializer,
     VendorAssessmentCreateUpdateSerializer, AssessmentComparisonSerializer,
     AssessmentQuestionSerializer, AssessmentTemplateSerializer,
     AssessmentTemplateDetailSerializer, AssessmentEvidenceSerializer,
-    AssessmentSummarySerializer, AssessmentQuestionnaireResponseSerializer,
-    AssessmentApprovalSerializer
+    AssessmentQuestionnaireResponseSerializer,
+    AssessmentApprovalSerializer, BulkAssessmentCreateSerializer, CATEGORY_DISPLAY
 )
 from drf_yasg.utils import swagger_auto_schema
 
@@ -38,11 +42,7 @@ def assessment_list_create(request):
     
     if request.method == 'GET':
         # Get assessments for organization's vendors
-        vendor_ids = Vendor.objects.filter(
-            organization= profile.organization
-        ).values_list('id', flat=True)
-        
-        assessments = VendorAssessment.objects.filter(vendor_id__in=vendor_ids)
+        assessments = VendorAssessment.objects.filter(vendor__organization=profile.organization)
         
         # Apply filters
         vendor_id = request.query_params.get('vendor_id')
@@ -57,11 +57,17 @@ def assessment_list_create(request):
         if assessment_type:
             assessments = assessments.filter(assessment_type=assessment_type)
         
-        # Ordering
-        assessments = assessments.order_by('-assessment_date')
+        # Ordering; plain rows with just the listed columns, no model instances
+        assessments = assessments.order_by('-assessment_date').values(
+            *VendorAssessmentListDictSerializer.VALUES_FIELDS,
+            **VendorAssessmentListDictSerializer.VALUES_EXPRESSIONS
+        )
         
-        serializer = VendorAssessmentListSerializer(assessments, many=True)
-        return Response(serializer.data)
+        # One page per request, sized by the project's PAGE_SIZE
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(assessments, request)
+        serializer = VendorAssessmentListDictSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     elif request.method == 'POST':
         # Check permissions
@@ -100,14 +106,23 @@ def assessment_list_create(request):
 def assessment_detail(request, assessment_id):
     """Get, update, or delete an assessment"""
     profile = request.user.profile
-    assessment = get_object_or_404(VendorAssessment, id=assessment_id)
-    
-    # Verify vendor belongs to organization
-    if assessment.vendor.organization != profile.organization:
-        return Response(
-            {'error': 'Not authorized'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+    assessment = get_object_or_404(
+        VendorAssessment.objects.select_related(
+            'vendor__organization', 'assessed_by', 'approved_by'
+        ).prefetch_related(
+            Prefetch(
+                'evidence',
+                queryset=AssessmentEvidence.objects.select_related('uploaded_by').only(
+                    'id', 'assessment_id', 'evidence_type', 'title', 'description',
+                    'file', 'question_id', 'uploaded_by_id', 'uploaded_at',
+                    'uploaded_by__first_name', 'uploaded_by__last_name'
+                )
+            )
+        ),
+        # Scoped to the user's organization; other organizations' assessments are a 404
+        id=assessment_id,
+        vendor__organization_id=profile.organization_id
+    )
     
     if request.method == 'GET':
         serializer = VendorAssessmentDetailSerializer(assessment)
@@ -149,6 +164,8 @@ def assessment_detail(request, assessment_id):
             )
         
         assessment.delete()
+        clear_dashboard_cache(profile.organization_id)
+        clear_assessment_summary_cache(profile.organization_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -165,13 +182,11 @@ def approve_assessment(request, assessment_id):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    assessment = get_object_or_404(VendorAssessment, id=assessment_id)
-    
-    if assessment.vendor.organization != profile.organization:
-        return Response(
-            {'error': 'Not authorized'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+    assessment = get_object_or_404(
+        VendorAssessment.objects.select_related('vendor__organization', 'assessed_by'),
+        id=assessment_id,
+        vendor__organization_id=profile.organization_id
+    )
     
     if assessment.status != 'completed':
         return Response(
@@ -195,19 +210,20 @@ def approve_assessment(request, assessment_id):
 def compare_assessments(request, assessment_id):
     """Compare assessment with previous assessment for same vendor"""
     profile = request.user.profile
-    current = get_object_or_404(VendorAssessment, id=assessment_id)
+    current = get_object_or_404(
+        VendorAssessment.objects.select_related('vendor__organization'),
+        id=assessment_id,
+        vendor__organization_id=profile.organization_id
+    )
     
-    if current.vendor.organization != profile.organization:
-        return Response(
-            {'error': 'Not authorized'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    # Find previous assessment
+    # Find previous assessment; only the columns the comparison reads
     previous = VendorAssessment.objects.filter(
-        vendor=current.vendor,
+        vendor_id=current.vendor_id,
         assessment_date__lt=current.assessment_date,
         status__in=['completed', 'approved']
+    ).only(
+        'assessment_date', 'overall_score',
+        *(field for field, _ in VendorAssessment.SCORE_WEIGHTS)
     ).order_by('-assessment_date').first()
     
     if not previous:
@@ -217,16 +233,12 @@ def compare_assessments(request, assessment_id):
         })
     
     # Calculate changes
-    changes = {
-        'overall': current.overall_score - previous.overall_score,
-        'access_control': current.access_control_score - previous.access_control_score,
-        'data_protection': current.data_protection_score - previous.data_protection_score,
-        'network_security': current.network_security_score - previous.network_security_score,
-        'incident_response': current.incident_response_score - previous.incident_response_score,
-        'vulnerability_management': current.vulnerability_management_score - previous.vulnerability_management_score,
-        'business_continuity': current.business_continuity_score - previous.business_continuity_score,
-        'security_governance': current.security_governance_score - previous.security_governance_score,
-    }
+    current_scores = current.get_score_breakdown()
+    previous_scores = previous.get_score_breakdown()
+    changes = {'overall': current_scores['overall'] - previous_scores['overall']}
+    for category, score in current_scores.items():
+        if category != 'overall':
+            changes[category] = score - previous_scores[category]
     
     # Calculate improvement percentage
     if previous.overall_score > 0:
@@ -246,12 +258,12 @@ def compare_assessments(request, assessment_id):
         'current': {
             'date': current.assessment_date,
             'overall_score': current.overall_score,
-            'category_scores': current.get_score_breakdown()
+            'category_scores': current_scores
         },
         'previous': {
             'date': previous.assessment_date,
             'overall_score': previous.overall_score,
-            'category_scores': previous.get_score_breakdown()
+            'category_scores': previous_scores
         },
         'changes': changes,
         'improvement_percentage': improvement_percentage,
@@ -268,51 +280,76 @@ def assessment_summary(request):
     """Get assessment portfolio summary"""
     profile = request.user.profile
     
-    org = profile.organization
-    vendor_ids = Vendor.objects.filter(organization=org).values_list('id', flat=True)
-    assessments = VendorAssessment.objects.filter(vendor_id__in=vendor_ids)
+    # Serve the precomputed summary; it is dropped whenever an assessment or vendor changes
+    cache_key = ASSESSMENT_SUMMARY_CACHE_KEY.format(profile.organization_id)
+    data = cache.get(cache_key)
+    if data is None:
+        data = build_assessment_summary(profile.organization)
+        cache.set(cache_key, data, ASSESSMENT_SUMMARY_CACHE_TTL)
+    return Response(data)
+
+
+def build_assessment_summary(org):
+    """
+    Aggregate the assessment portfolio summary of an organization.
+    Returns response-ready primitives, so no summary serializer pass is needed.
+    """
+    assessments = VendorAssessment.objects.filter(vendor__organization=org)
     
     # Recent assessments (last 30 days)
     thirty_days_ago = timezone.now() - timedelta(days=30)
-    recent = assessments.filter(created_at__gte=thirty_days_ago).order_by('-created_at')[:10]
-    
-    # Vendors needing assessment
-    all_vendors = Vendor.objects.filter(organization=org, is_active=True)
-    assessed_vendor_ids = assessments.values_list('vendor_id', flat=True).distinct()
-    vendors_needing_assessment = all_vendors.exclude(id__in=assessed_vendor_ids)
-    
-    # Also include vendors whose last assessment is > 1 year old
+    recent = assessments.filter(
+        created_at__gte=thirty_days_ago
+    ).order_by('-created_at').values(
+        *VendorAssessmentListDictSerializer.VALUES_FIELDS,
+        **VendorAssessmentListDictSerializer.VALUES_EXPRESSIONS
+    )[:10]
+    
+    # Vendors needing assessment: never assessed, or last assessment > 1 year old
     one_year_ago = timezone.now().date() - timedelta(days=365)
-    for vendor in all_vendors:
-        last_assessment = assessments.filter(vendor=vendor).order_by('-assessment_date').first()
-        if last_assessment and last_assessment.assessment_date < one_year_ago:
-            vendors_needing_assessment = vendors_needing_assessment | all_vendors.filter(id=vendor.id)
+    latest_assessment_date = VendorAssessment.objects.filter(
+        vendor=OuterRef('pk')
+    ).order_by('-assessment_date').values('assessment_date')[:1]
+    vendors_needing_assessment = Vendor.objects.filter(
+        organization=org, is_active=True
+    ).annotate(
+        last_assessment_date=Subquery(latest_assessment_date)
+    ).filter(
+        Q(last_assessment_date__isnull=True) | Q(last_assessment_date__lt=one_year_ago)
+    ).only('id', 'name', 'risk_level')
+    
+    # Counts per status, total and average score in a single aggregate query
+    stats = assessments.aggregate(
+        total=Count('id'),
+        average_score=Avg('overall_score', filter=Q(status__in=['completed', 'approved'])),
+        **{
+            f'status_{status_choice}': Count('id', filter=Q(status=status_choice))
+            for status_choice, _ in VendorAssessment.STATUS_CHOICES
+        }
+    )
     
     # Status breakdown
     by_status = {}
-    for status_choice, _ in VendorAssessment._meta.get_field('status').choices:
-        count = assessments.filter(status=status_choice).count()
+    for status_choice, _ in VendorAssessment.STATUS_CHOICES:
+        count = stats[f'status_{status_choice}']
         if count > 0:
             by_status[status_choice] = count
     
     summary = {
-        'total_assessments': assessments.count(),
-        'completed_assessments': assessments.filter(status__in=['completed', 'approved']).count(),
-        'pending_assessments': assessments.filter(status__in=['draft', 'in_progress']).count(),
-        'average_score': assessments.filter(status__in=['completed', 'approved']).aggregate(
-            Avg('overall_score')
-        )['overall_score__avg'] or 0,
+        'total_assessments': stats['total'],
+        'completed_assessments': stats['status_completed'] + stats['status_approved'],
+        'pending_assessments': stats['status_draft'] + stats['status_in_progress'],
+        'average_score': stats['average_score'] or 0,
         'by_status': by_status,
-        'recent_assessments': VendorAssessmentListSerializer(recent, many=True).data,
+        # Plain list rather than ReturnList, which pickles slower into the cache
+        'recent_assessments': list(VendorAssessmentListDictSerializer(recent, many=True).data),
         'vendors_needing_assessment': [
             {'id': str(v.id), 'name': v.name, 'risk_level': v.risk_level}
             for v in vendors_needing_assessment[:10]
         ],
         'score_trends': []  # Could add monthly trends
     }
-    
-    serializer = AssessmentSummarySerializer(summary)
-    return Response(serializer.data)
+    return summary
 
 
 @swagger_auto_schema(methods=['POST'], request_body=AssessmentQuestionSerializer)
@@ -347,10 +384,14 @@ def question_list_create(request):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        serializer = AssessmentQuestionSerializer(data=request.data)
+        # A JSON list creates every question in one batch
+        serializer = AssessmentQuestionSerializer(
+            data=request.data,
+            many=isinstance(request.data, list)
+        )
         
         if serializer.is_valid():
-            question = serializer.save(created_by=request.user)
+            serializer.save(created_by=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -370,10 +411,16 @@ def get_questionnaire_template(request):
         # Get all active questions
         questions = AssessmentQuestion.objects.filter(is_active=True).order_by('category', 'order')
     
+    # Single query for just the rendered columns; reused for the total below
+    questions = list(questions.values(
+        'id', 'category', 'question_text', 'guidance', 'response_type',
+        'response_options', 'is_required', 'weight', 'max_score'
+    ))
+    
     # Group by category
     categories = {}
     for question in questions:
-        category = question.get_category_display()
+        category = CATEGORY_DISPLAY.get(question['category'], question['category'])
         if category not in categories:
             categories[category] = {
                 'name': category,
@@ -381,21 +428,21 @@ def get_questionnaire_template(request):
             }
         
         categories[category]['questions'].append({
-            'id': str(question.id),
-            'question_text': question.question_text,
-            'guidance': question.guidance,
-            'response_type': question.response_type,
-            'response_options': question.response_options,
-            'is_required': question.is_required,
-            'weight': question.weight,
-            'max_score': question.max_score
+            'id': str(question['id']),
+            'question_text': question['question_text'],
+            'guidance': question['guidance'],
+            'response_type': question['response_type'],
+            'response_options': question['response_options'],
+            'is_required': question['is_required'],
+            'weight': question['weight'],
+            'max_score': question['max_score']
         })
     
     return Response({
         'template_id': str(template_id) if template_id else None,
         'template_name': template.name if template_id else 'Default Questionnaire',
         'categories': list(categories.values()),
-        'total_questions': questions.count()
+        'total_questions': len(questions)
     })
 
 
@@ -406,10 +453,12 @@ def get_questionnaire_template(request):
 @parser_classes([JSONParser, FormParser, MultiPartParser])
 def template_list_create(request):
     """List templates or create new template (admin only)"""
-    profile = get_object_or_404(UserProfile, user = request.user)
+    profile = request.user.profile
     
     if request.method == 'GET':
-        templates = AssessmentTemplate.objects.filter(is_active=True)
+        templates = AssessmentTemplate.objects.filter(is_active=True).annotate(
+            question_count=Count('questions', distinct=True)
+        )
         serializer = AssessmentTemplateSerializer(templates, many=True)
         return Response(serializer.data)
     
@@ -436,7 +485,14 @@ def template_list_create(request):
 def template_detail(request, template_id):
     """Get template details with questions"""
     
-    template = get_object_or_404(AssessmentTemplate, id=template_id)
+    template = get_object_or_404(
+        AssessmentTemplate.objects.annotate(
+            question_count=Count('questions', distinct=True)
+        ).prefetch_related(
+            Prefetch('templatequestion_set', queryset=TemplateQuestion.objects.select_related('question'))
+        ),
+        id=template_id
+    )
     serializer = AssessmentTemplateDetailSerializer(template)
     return Response(serializer.data)
 
@@ -450,16 +506,20 @@ def evidence_list_create(request, assessment_id):
     """List or upload evidence for assessment"""
     profile = request.user.profile
     
-    assessment = get_object_or_404(VendorAssessment, id=assessment_id)
-    
-    if assessment.vendor.organization != profile.organization:
-        return Response(
-            {'error': 'Not authorized'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+    assessment = get_object_or_404(
+        VendorAssessment,
+        id=assessment_id,
+        vendor__organization_id=profile.organization_id
+    )
     
     if request.method == 'GET':
-        evidence = AssessmentEvidence.objects.filter(assessment=assessment)
+        evidence = AssessmentEvidence.objects.filter(
+            assessment=assessment
+        ).select_related('uploaded_by').only(
+            'id', 'assessment_id', 'evidence_type', 'title', 'description',
+            'file', 'question_id', 'uploaded_by_id', 'uploaded_at',
+            'uploaded_by__first_name', 'uploaded_by__last_name'
+        )
         serializer = AssessmentEvidenceSerializer(evidence, many=True)
         return Response(serializer.data)
     
@@ -484,20 +544,64 @@ def evidence_delete(request, evidence_id):
     """Delete evidence"""
     profile = request.user.profile
     
-    evidence = get_object_or_404(AssessmentEvidence, id=evidence_id)
+    evidence = get_object_or_404(
+        AssessmentEvidence,
+        id=evidence_id,
+        assessment__vendor__organization_id=profile.organization_id
+    )
     
-    if evidence.assessment.vendor.organization != profile.organization:
+    # Can only delete if uploader or admin
+    if evidence.uploaded_by_id != request.user.id and profile.role != 'admin':
         return Response(
-            {'error': 'Not authorized'},
+            {'error': 'Only the uploader or admin can delete evidence'},
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Can only delete if uploader or admin
-    if evidence.uploaded_by != request.user and profile.role != 'admin':
+    evidence.delete()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@swagger_auto_schema(methods=['POST'], request_body=BulkAssessmentCreateSerializer)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser, FormParser, MultiPartParser])
+def bulk_create_assessments(request):
+    """Schedule a draft assessment from a template for several vendors at once"""
+    profile = request.user.profile
+    
+    if profile.role not in ['admin', 'analyst', 'manager']:
         return Response(
-            {'error': 'Only the uploader or admin can delete evidence'},
+            {'error': 'Insufficient permissions to create assessments'},
             status=status.HTTP_403_FORBIDDEN
         )
     
-    evidence.delete()
-    return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    serializer = BulkAssessmentCreateSerializer(
+        data=request.data,
+        context={'request': request}
+    )
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    vendor_ids = serializer.validated_data['vendor_ids']
+    found = Vendor.objects.filter(id__in=vendor_ids, organization_id=profile.organization_id).count()
+    if found != len(vendor_ids):
+        return Response(
+            {'error': 'One or more vendors not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    assessments = serializer.save()
+    # bulk_create sends no post_save, so drop the cached summaries here
+    clear_dashboard_cache(profile.organization_id)
+    clear_assessment_summary_cache(profile.organization_id)
+    
+    created = VendorAssessment.objects.filter(
+        id__in=[assessment.id for assessment in assessments]
+    ).order_by('vendor__name').values(
+        *VendorAssessmentListDictSerializer.VALUES_FIELDS,
+        **VendorAssessmentListDictSerializer.VALUES_EXPRESSIONS
+    )
+    return Response({
+        'message': f'Successfully created {len(assessments)} assessments',
+        'assessments': VendorAssessmentListDictSerializer(created, many=True).data
+    }, status=status.HTTP_201_CREATED)
@@ -0,0 +1,43 @@
+import functools
+import logging
+
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+def _fail_safe(fallback):
+    """Log a Redis error and return fallback(*args, **kwargs) instead of raising"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except RedisError:
+                logger.warning("Cache %s failed; carrying on without the cache", method.__name__, exc_info=True)
+                return fallback(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _get_default(key, default=None, version=None):
+    return default
+
+
+class FailSafeRedisCache(RedisCache):
+    """
+    RedisCache that treats an unreachable Redis as a cache miss: reads
+    return the default, writes are dropped, and the error is logged.
+    Callers (views, throttles, cachalot) then fall back to the database.
+    """
+
+    get = _fail_safe(_get_default)(RedisCache.get)
+    get_many = _fail_safe(lambda keys, version=None: {})(RedisCache.get_many)
+    has_key = _fail_safe(lambda key, version=None: False)(RedisCache.has_key)
+    add = _fail_safe(lambda *args, **kwargs: False)(RedisCache.add)
+    set = _fail_safe(lambda *args, **kwargs: None)(RedisCache.set)
+    set_many = _fail_safe(lambda data, *args, **kwargs: list(data))(RedisCache.set_many)
+    touch = _fail_safe(lambda *args, **kwargs: False)(RedisCache.touch)
+    delete = _fail_safe(lambda *args, **kwargs: False)(RedisCache.delete)
+    delete_many = _fail_safe(lambda *args, **kwargs: None)(RedisCache.delete_many)
@@ -1,8 +1,14 @@
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 
+# Cached dashboard payloads per organization; bump the version when their shape changes
+ORGANIZATION_STATS_CACHE_KEY = 'org:{}:stats:v1'
+DASHBOARD_OVERVIEW_CACHE_KEY = 'org:{}:dashboard_overview:v1'
+DASHBOARD_CACHE_TTL = 180
+
 class Organization(models.Model):
     """Multi-tenant organization model"""
     size_choice =[
@@ -92,13 +98,54 @@ from django.dispatch import receiver
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def manage_user_profile(sender, instance, created, **kwargs):
+    # Only new users need a profile; later user saves leave it untouched
     if created:
-        UserProfile.objects.create(user=instance)   
+        UserProfile.objects.create(user=instance)
+
+
+def clear_dashboard_cache(organization_id):
+    """Drop the cached stats and dashboard overview of an organization"""
+    if organization_id is None:
+        return
+    cache.delete_many([
+        ORGANIZATION_STATS_CACHE_KEY.format(organization_id),
+        DASHBOARD_OVERVIEW_CACHE_KEY.format(organization_id),
+    ])
+
+
+# Senders are given as app labels; those apps import this module.
+# Only post_save is hooked: a delete receiver would turn off Django's fast
+# cascade delete, so the delete views and bulk writes call clear_dashboard_cache
+# themselves. Receivers work from the *_id columns instead of loading relations.
+@receiver(post_save, sender='core.UserProfile')
+@receiver(post_save, sender='vendors.Vendor')
+@receiver(post_save, sender='simulations.Simulation')
+def clear_dashboard_cache_for_owned(sender, instance, **kwargs):
+    clear_dashboard_cache(instance.organization_id)
+
+
+@receiver(post_save, sender='vendors.IncidentHistory')
+@receiver(post_save, sender='vendors.ComplianceCertification')
+@receiver(post_save, sender='assessments.VendorAssessment')
+def clear_dashboard_cache_for_vendor_data(sender, instance, **kwargs):
+    from vendors.models import vendor_organization_id
+    clear_dashboard_cache(vendor_organization_id(instance))
+
+
+@receiver(post_save, sender='simulations.SimulationResult')
+def clear_dashboard_cache_for_result(sender, instance, **kwargs):
+    if sender.simulation.is_cached(instance):
+        clear_dashboard_cache(instance.simulation.organization_id)
+        return
+    from simulations.models import Simulation
+    clear_dashboard_cache(
+        Simulation.objects.filter(pk=instance.simulation_id).values_list('organization_id', flat=True).first()
+    )
+
 
-    else:
-        profile = getattr(instance, 'profile', None)
-        if profile:
-            profile.save()
+@receiver(post_save, sender=Organization)
+def clear_dashboard_cache_for_organization(sender, instance, **kwargs):
+    clear_dashboard_cache(instance.id)
 
 class OrganizationRequest(models.Model):
     """Model to manage requests to join an organization"""
@@ -51,21 +51,23 @@ class UserSerializer(serializers.ModelSerializer):
         role = validated_data.pop('role', None)
         phone = validated_data.pop('phone', None)
         
-        # Update user fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        # Update user fields; only the changed columns
+        if validated_data:
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save(update_fields=[*validated_data, 'updated_at'])
         
-        # Update profile
-        
-        profile = instance.get_or_create_profile()
+        # Update profile in one upsert with just the provided fields
+        defaults = {}
         if organization_id is not None:
-            profile.organization_id = organization_id
+            defaults['organization_id'] = organization_id
         if role is not None:
-            profile.role = role
+            defaults['role'] = role
         if phone is not None:
-            profile.phone = phone
-        profile.save()
+            defaults['phone'] = phone
+        if defaults:
+            profile, _ = UserProfile.objects.update_or_create(user=instance, defaults=defaults)
+            instance.profile = profile
         
         return instance
 
@@ -94,11 +96,18 @@ class OrganizationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
+    # List querysets annotate both counts; single objects fall back to a COUNT query
     def get_user_count(self, obj):
-        return obj.user_profiles.count()
+        user_count = getattr(obj, 'user_count', None)
+        if user_count is None:
+            return obj.user_profiles.count()
+        return user_count
     
     def get_vendor_count(self, obj):
-        return obj.vendors.count()
+        vendor_count = getattr(obj, 'vendor_count', None)
+        if vendor_count is None:
+            return obj.vendors.count()
+        return vendor_count
 
 
 class OrganizationDetailSerializer(OrganizationSerializer):
@@ -1,3 +1,165 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db.models.signals import pre_delete, post_delete
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from Account.models import CustomUser
+from assessments.models import VendorAssessment
+from simulations.models import ScenarioTemplate, Simulation, SimulationResult
+from vendors.models import Vendor, IncidentHistory, ComplianceCertification, vendor_organization_id
+from .cache import FailSafeRedisCache
+from .models import Organization, ORGANIZATION_STATS_CACHE_KEY, DASHBOARD_OVERVIEW_CACHE_KEY
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DashboardCacheInvalidationTests(TestCase):
+    """Writes to an organization's data must drop its cached stats and dashboard"""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(
+            name='Acme', industry='Finance', size='Medium', country='US'
+        )
+        self.user = CustomUser.objects.create_user(
+            email='admin@example.com', password='pass12345', first_name='Ada', last_name='Admin'
+        )
+        profile = self.user.profile
+        profile.organization = self.organization
+        profile.role = 'admin'
+        profile.save()
+        self.vendor = Vendor.objects.create(
+            organization=self.organization,
+            name='Cloudy',
+            industry='Technology',
+            country='US',
+            contact_name='Contact',
+            contact_email='contact@example.com',
+            services_provided='Hosting',
+            contract_start_date=date(2026, 1, 1),
+            contract_end_date=date(2027, 1, 1),
+            contract_value=Decimal('100000.00'),
+        )
+        self.keys = [
+            ORGANIZATION_STATS_CACHE_KEY.format(self.organization.id),
+            DASHBOARD_OVERVIEW_CACHE_KEY.format(self.organization.id),
+        ]
+        self.fill_cache()
+
+    def fill_cache(self):
+        cache.set_many({key: {'stale': True} for key in self.keys})
+
+    def assert_cache_cleared(self):
+        self.assertEqual(cache.get_many(self.keys), {})
+
+    def test_vendor_save_clears_cache(self):
+        self.vendor.name = 'Cloudier'
+        self.vendor.save()
+        self.assert_cache_cleared()
+
+    def test_incident_save_clears_cache(self):
+        IncidentHistory.objects.create(
+            vendor=self.vendor,
+            incident_date=date(2026, 3, 1),
+            incident_type='data_breach',
+            severity='high',
+            title='Leak',
+            description='Customer records exposed',
+        )
+        self.assert_cache_cleared()
+
+    def test_simulation_result_save_clears_cache(self):
+        template, _ = ScenarioTemplate.objects.get_or_create(
+            scenario_type='data_breach',
+            defaults={'name': 'Data Breach', 'description': 'Data breach'}
+        )
+        simulation = Simulation.objects.create(
+            organization=self.organization,
+            name='Breach',
+            scenario_template=template,
+            target_vendor=self.vendor,
+        )
+        self.fill_cache()
+        # Saved by id only, so the receiver has to look the organization up
+        SimulationResult.objects.create(simulation_id=simulation.id)
+        self.assert_cache_cleared()
+
+    def test_vendor_delete_view_clears_cache(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.delete(reverse('vendors:vendor-detail', args=[self.vendor.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assert_cache_cleared()
+
+    def test_no_delete_receivers(self):
+        # Any delete receiver would turn off Django's fast cascade delete
+        for model in (Vendor, Simulation, SimulationResult, IncidentHistory,
+                      ComplianceCertification, VendorAssessment):
+            with self.subTest(model=model.__name__):
+                self.assertFalse(pre_delete.has_listeners(model))
+                self.assertFalse(post_delete.has_listeners(model))
+
+
+class VendorOrganizationIdTests(TestCase):
+    def setUp(self):
+        organization = Organization.objects.create(
+            name='Acme', industry='Finance', size='Medium', country='US'
+        )
+        vendor = Vendor.objects.create(
+            organization=organization,
+            name='Cloudy',
+            industry='Technology',
+            country='US',
+            contact_name='Contact',
+            contact_email='contact@example.com',
+            services_provided='Hosting',
+            contract_start_date=date(2026, 1, 1),
+            contract_end_date=date(2027, 1, 1),
+            contract_value=Decimal('100000.00'),
+        )
+        self.organization_id = organization.id
+        self.incident = IncidentHistory.objects.create(
+            vendor=vendor,
+            incident_date=date(2026, 3, 1),
+            incident_type='data_breach',
+            severity='high',
+            title='Leak',
+            description='Customer records exposed',
+        )
+
+    def test_reads_the_column_when_vendor_is_not_loaded(self):
+        incident = IncidentHistory.objects.get(pk=self.incident.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(vendor_organization_id(incident), self.organization_id)
+
+    def test_uses_the_loaded_vendor(self):
+        incident = IncidentHistory.objects.select_related('vendor').get(pk=self.incident.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(vendor_organization_id(incident), self.organization_id)
+
+
+class FailSafeRedisCacheTests(SimpleTestCase):
+    """An unreachable Redis behaves like an empty cache instead of raising"""
+
+    def setUp(self):
+        # Nothing listens on port 1
+        self.cache = FailSafeRedisCache('redis://127.0.0.1:1/0', {})
+
+    def test_reads_miss(self):
+        with self.assertLogs('core.cache', 'WARNING'):
+            self.assertEqual(self.cache.get('key', 'fallback'), 'fallback')
+            self.assertEqual(self.cache.get_many(['a', 'b']), {})
+            self.assertFalse(self.cache.has_key('key'))
+
+    def test_writes_are_dropped(self):
+        with self.assertLogs('core.cache', 'WARNING'):
+            self.cache.set('key', 1, 60)
+            self.assertEqual(self.cache.set_many({'a': 1, 'b': 2}), ['a', 'b'])
+            self.assertFalse(self.cache.add('key', 1))
+            self.cache.delete('key')
+            self.cache.delete_many(['a', 'b'])
@@ -1,12 +1,27 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, Sum
 from django.contrib.auth import get_user_model
-
-from .models import Organization, UserProfile, OrganizationRequest
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+
+from vendors.models import Vendor, IncidentHistory, ComplianceCertification
+from simulations.models import Simulation, SimulationResult
+from assessments.models import VendorAssessment
+from vendors.serializers import VendorListSerializer
+from simulations.serializers import SimulationListSerializer
+
+from .models import (
+    Organization, UserProfile, OrganizationRequest,
+    ORGANIZATION_STATS_CACHE_KEY, DASHBOARD_OVERVIEW_CACHE_KEY, DASHBOARD_CACHE_TTL
+)
 from .serializers import (
     UserSerializer, UserListSerializer, UserProfileSerializer,
     OrganizationSerializer, OrganizationDetailSerializer,
@@ -18,6 +33,47 @@ from .serializers import (
 User = get_user_model()
 from drf_yasg.utils import swagger_auto_schema
 
+# Role -> permission flags served by get_user_permissions
+# (can_create_simulations comes from UserProfile.can_create_simulations)
+ROLE_PERMISSIONS = {
+    'admin': {
+        'can_create_vendors': True,
+        'can_delete_vendors': True,
+        'can_manage_users': True,
+        'can_approve_assessments': True,
+        'can_edit_organization': True,
+    },
+    'manager': {
+        'can_create_vendors': True,
+        'can_delete_vendors': False,
+        'can_manage_users': True,
+        'can_approve_assessments': True,
+        'can_edit_organization': False,
+    },
+    'analyst': {
+        'can_create_vendors': True,
+        'can_delete_vendors': False,
+        'can_manage_users': False,
+        'can_approve_assessments': False,
+        'can_edit_organization': False,
+    },
+}
+NO_PERMISSIONS = {
+    'can_create_vendors': False,
+    'can_delete_vendors': False,
+    'can_manage_users': False,
+    'can_approve_assessments': False,
+    'can_edit_organization': False,
+}
+
+
+def _users_with_profile():
+    """Users with profile and organization joined in, minus the auth-only columns"""
+    return User.objects.select_related('profile__organization').only(
+        'id', 'email', 'first_name', 'last_name', 'is_verified',
+        'is_active', 'created_at', 'updated_at'
+    )
+
 
 
 @api_view(['GET'])
@@ -81,8 +137,15 @@ def list_users(request):
             Q(last_name__icontains=search)
         )
     
-    serializer = UserListSerializer(users, many=True)
-    return Response(serializer.data)
+    # Profile and organization joined in, only the listed columns; one page per request
+    users = users.select_related('profile__organization').only(
+        'id', 'email', 'first_name', 'last_name', 'is_active',
+        'profile__role', 'profile__organization__name'
+    ).order_by('email')
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(users, request)
+    serializer = UserListSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['GET'])
@@ -91,7 +154,7 @@ def get_user_detail(request, user_id):
     """Get specific user details"""
     profile = request.user.profile
     
-    user = get_object_or_404(User, id=user_id)
+    user = get_object_or_404(_users_with_profile(), id=user_id)
     
     # Check if user can view this profile
     if request.user.id != user.id and profile.role not in ['admin', 'manager']:
@@ -107,6 +170,7 @@ def get_user_detail(request, user_id):
 @swagger_auto_schema(methods=['PUT', 'PATCH'], request_body=UserSerializer)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def update_user(request, user_id):
     """Update user (admin only)"""
     profile = request.user.profile  
@@ -116,7 +180,7 @@ def update_user(request, user_id):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    user = get_object_or_404(User, id=user_id)
+    user = get_object_or_404(_users_with_profile(), id=user_id)
     
     serializer = UserSerializer(
         user,
@@ -134,10 +198,11 @@ def update_user(request, user_id):
 @swagger_auto_schema(methods=['PUT', 'PATCH'], request_body=UserProfileSerializer)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def update_user_profile(request, user_id):
     """Update user profile"""
     profile = request.user.profile
-    user = get_object_or_404(User, id=user_id)
+    user = get_object_or_404(_users_with_profile(), id=user_id)
     
     # Can only update own profile or if admin
     if request.user.id != user.id and profile.role != 'admin':
@@ -207,7 +272,10 @@ def get_organization(request):
 @permission_classes([IsAuthenticated])
 def  get_all_organizations(request):
     """Get list of all organizations"""
-    organizations = Organization.objects.all()
+    organizations = Organization.objects.annotate(
+        user_count=Count('user_profiles', distinct=True),
+        vendor_count=Count('vendors', distinct=True)
+    ).prefetch_related('user_profiles')
     serializer = OrganizationDetailSerializer(organizations, many=True)
     return Response(serializer.data)
 
@@ -215,6 +283,7 @@ def  get_all_organizations(request):
 @swagger_auto_schema(methods=['PUT', 'PATCH'], request_body=OrganizationSerializer)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def update_organization(request):
     """Update organization (admin only)"""
     profile = request.user.profile
@@ -246,11 +315,13 @@ def update_organization(request):
 @swagger_auto_schema(methods=['POST'], request_body=OrganizationSerializer)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def create_organization(request):
     """Create new organization (for onboarding)"""
-    profile = request.user.profile
+    # Lock the profile so concurrent onboarding requests cannot both create an organization
+    profile = UserProfile.objects.select_for_update().get(user=request.user)
     # Check if user already has organization
-    if profile.organization:
+    if profile.organization_id:
         return Response(
             {'error': 'User already associated with an organization'},
             status=status.HTTP_400_BAD_REQUEST
@@ -261,11 +332,10 @@ def create_organization(request):
     if serializer.is_valid():
         organization = serializer.save()
         
-        # Update or create user profile with this organization
-        
+        # Attach the creator's profile to the new organization; only the changed columns
         profile.organization = organization
         profile.role = 'admin'  # Creator becomes admin
-        profile.save()
+        profile.save(update_fields=['organization', 'role', 'updated_at'])
         
         return Response(
             OrganizationDetailSerializer(organization).data,
@@ -287,12 +357,11 @@ def get_organization_stats(request):
     
     org = profile.organization
     
-    # Import here to avoid circular imports
-    from vendors.models import Vendor
-    from simulations.models import Simulation
-    from assessments.models import VendorAssessment
-    from django.utils import timezone
-    from datetime import timedelta
+    # Serve the cached stats; dropped whenever the underlying data changes
+    cache_key = ORGANIZATION_STATS_CACHE_KEY.format(org.id)
+    data = cache.get(cache_key)
+    if data is not None:
+        return Response(data)
     
     # Calculate stats
     vendors = Vendor.objects.filter(organization=org)
@@ -304,7 +373,6 @@ def get_organization_stats(request):
     recent_assessments = assessments.filter(created_at__gte=thirty_days_ago).count()
     
     # Expiring certifications (next 90 days)
-    from vendors.models import ComplianceCertification
     ninety_days_ahead = timezone.now().date() + timedelta(days=90)
     expiring_certifications = ComplianceCertification.objects.filter(
         vendor__organization=org,
@@ -312,24 +380,40 @@ def get_organization_stats(request):
         is_active=True
     ).count()
     
+    # One conditional aggregate per table instead of a COUNT per metric
+    vendor_stats = vendors.aggregate(
+        total=Count('id'),
+        low=Count('id', filter=Q(risk_level='low')),
+        medium=Count('id', filter=Q(risk_level='medium')),
+        high=Count('id', filter=Q(risk_level='high')),
+        critical=Count('id', filter=Q(risk_level='critical')),
+        average_risk_score=Avg('overall_risk_score'),
+    )
+    simulation_stats = simulations.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+    )
+    
     stats = {
-        'total_vendors': vendors.count(),
-        'high_risk_vendors': vendors.filter(risk_level__in=['high', 'critical']).count(),
-        'total_simulations': simulations.count(),
-        'completed_simulations': simulations.filter(status='completed').count(),
-        'average_risk_score': vendors.aggregate(Avg('overall_risk_score'))['overall_risk_score__avg'] or 0,
+        'total_vendors': vendor_stats['total'],
+        'high_risk_vendors': vendor_stats['high'] + vendor_stats['critical'],
+        'total_simulations': simulation_stats['total'],
+        'completed_simulations': simulation_stats['completed'],
+        'average_risk_score': vendor_stats['average_risk_score'] or 0,
         'vendors_by_risk_level': {
-            'low': vendors.filter(risk_level='low').count(),
-            'medium': vendors.filter(risk_level='medium').count(),
-            'high': vendors.filter(risk_level='high').count(),
-            'critical': vendors.filter(risk_level='critical').count(),
+            'low': vendor_stats['low'],
+            'medium': vendor_stats['medium'],
+            'high': vendor_stats['high'],
+            'critical': vendor_stats['critical'],
         },
         'recent_assessments': recent_assessments,
         'expiring_certifications': expiring_certifications,
     }
     
-    serializer = OrganizationStatsSerializer(stats)
-    return Response(serializer.data)
+    # Cache plain containers; DRF's ReturnDict/OrderedDict pickle noticeably slower
+    data = dict(OrganizationStatsSerializer(stats).data)
+    cache.set(cache_key, data, DASHBOARD_CACHE_TTL)
+    return Response(data)
 
 
 @api_view(['GET'])
@@ -345,29 +429,28 @@ def get_dashboard_overview(request):
     
     org = profile.organization
     
-    from vendors.models import Vendor, IncidentHistory
-    from simulations.models import Simulation, SimulationResult
-    from assessments.models import VendorAssessment
-    from vendors.serializers import VendorListSerializer
-    from simulations.serializers import SimulationListSerializer
-    from django.utils import timezone
-    from datetime import timedelta
-    from decimal import Decimal
+    # Serve the cached overview; dropped whenever the underlying data changes
+    cache_key = DASHBOARD_OVERVIEW_CACHE_KEY.format(org.id)
+    overview = cache.get(cache_key)
+    if overview is not None:
+        return Response(overview)
     
     # Vendors
     vendors = Vendor.objects.filter(organization=org)
     high_risk_vendors = vendors.filter(risk_level__in=['high', 'critical']).order_by('-overall_risk_score')[:5]
     
-    # Simulations
+    # Simulations; relations read by SimulationListSerializer joined in
     recent_simulations = Simulation.objects.filter(
         organization=org,
         status='completed'
+    ).select_related(
+        'scenario_template', 'target_vendor', 'created_by', 'result'
     ).order_by('-completed_at')[:5]
     
     # Total estimated impact from all simulations
     total_impact = SimulationResult.objects.filter(
         simulation__organization=org
-    ).aggregate(total=models.Sum('total_financial_impact'))['total'] or Decimal('0')
+    ).aggregate(total=Sum('total_financial_impact'))['total'] or Decimal('0')
     
     # Recent incidents (last 6 months)
     six_months_ago = timezone.now().date() - timedelta(days=180)
@@ -382,22 +465,32 @@ def get_dashboard_overview(request):
         status__in=['draft', 'in_progress']
     ).count()
     
+    # All vendor summary figures in one aggregate query
+    vendor_stats = vendors.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        high_risk=Count('id', filter=Q(risk_level__in=['high', 'critical'])),
+        average_risk_score=Avg('overall_risk_score'),
+    )
+    
+    # Plain dicts/lists rather than DRF's ReturnDict/OrderedDict, which pickle slower into the cache
     overview = {
-        'organization': OrganizationSerializer(org).data,
+        'organization': dict(OrganizationSerializer(org).data),
         'summary': {
-            'total_vendors': vendors.count(),
-            'active_vendors': vendors.filter(is_active=True).count(),
-            'high_risk_vendors_count': vendors.filter(risk_level__in=['high', 'critical']).count(),
-            'average_risk_score': vendors.aggregate(Avg('overall_risk_score'))['overall_risk_score__avg'] or 0,
+            'total_vendors': vendor_stats['total'],
+            'active_vendors': vendor_stats['active'],
+            'high_risk_vendors_count': vendor_stats['high_risk'],
+            'average_risk_score': vendor_stats['average_risk_score'] or 0,
             'total_simulations': Simulation.objects.filter(organization=org).count(),
             'total_estimated_impact': float(total_impact),
             'recent_incidents': recent_incidents,
             'pending_assessments': pending_assessments,
         },
-        'high_risk_vendors': VendorListSerializer(high_risk_vendors, many=True).data,
-        'recent_simulations': SimulationListSerializer(recent_simulations, many=True).data,
+        'high_risk_vendors': [dict(v) for v in VendorListSerializer(high_risk_vendors, many=True).data],
+        'recent_simulations': [dict(s) for s in SimulationListSerializer(recent_simulations, many=True).data],
     }
     
+    cache.set(cache_key, overview, DASHBOARD_CACHE_TTL)
     return Response(overview)
 
 
@@ -410,17 +503,13 @@ def get_user_permissions(request):
     profile = request.user.profile
     role = profile.role
     
+    role_permissions = dict(ROLE_PERMISSIONS.get(role, NO_PERMISSIONS))
+    role_permissions['can_create_simulations'] = profile.can_create_simulations
+    
     permissions = {
         'role': role,
         'organization': OrganizationSerializer(profile.organization).data if profile.organization else None,
-        'permissions': {
-            'can_create_vendors': role in ['admin', 'analyst', 'manager'],
-            'can_delete_vendors': role == 'admin',
-            'can_create_simulations': profile.can_create_simulations,
-            'can_manage_users': role in ['admin', 'manager'],
-            'can_approve_assessments': role in ['admin', 'manager'],
-            'can_edit_organization': role == 'admin',
-        }
+        'permissions': role_permissions
     }
     
     return Response(permissions)
@@ -477,8 +566,3 @@ def approve_request(request, request_id):
     org_req.user.save()
 
     return Response({'message': 'Successfully approved'}, status=status.HTTP_200_OK)
-    
-
-
-
-from django.db import models
\ No newline at end of file
@@ -5,6 +5,7 @@ from .models import BusinessProcess, ScenarioTemplate, Simulation, SimulationRes
 class BusinessProcessAdmin(admin.ModelAdmin):
     list_display = ['name', 'organization', 'criticality_level', 'created_at']
     list_filter = ['criticality_level', 'organization']
+    list_select_related = ['organization']
 
 @admin.register(ScenarioTemplate)
 class ScenarioTemplateAdmin(admin.ModelAdmin):
@@ -16,7 +17,10 @@ class SimulationAdmin(admin.ModelAdmin):
     list_display = ['name', 'target_vendor', 'status', 'created_by', 'created_at']
     list_filter = ['status', 'scenario_template', 'created_at']
     search_fields = ['name', 'target_vendor__name']
+    list_select_related = ['target_vendor', 'created_by', 'scenario_template']
+    raw_id_fields = ['target_vendor', 'created_by']
 
 @admin.register(SimulationResult)
 class SimulationResultAdmin(admin.ModelAdmin):
-    list_display = ['simulation', 'total_financial_impact', 'downtime_hours', 'created_at']
\ No newline at end of file
+    list_display = ['simulation', 'total_financial_impact', 'downtime_hours', 'created_at']
+    list_select_related = ['simulation__scenario_template']
\ No newline at end of file
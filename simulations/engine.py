@@ -1,22 +1,55 @@
 import logging
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from decimal import Decimal
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any
 from django.conf import settings
+from django.utils.functional import cached_property
 from django.utils import timezone
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
 
 from .models import Simulation, SimulationResult, BusinessProcess
 from vendors.models import Vendor
 
 logger = logging.getLogger('simulations')
 
+# Cascade impact multiplier per vendor risk level; unknown levels count as medium
+CASCADE_RISK_MULTIPLIERS = {
+    'low': 0.5,
+    'medium': 1.0,
+    'high': 1.5,
+    'critical': 2.0,
+}
+
+
+def _to_money(value) -> Decimal:
+    """Convert a float amount to a 2-decimal Decimal for the money fields"""
+    return Decimal(str(round(value, 2)))
+
 
 class SimulationEngine:
     """
     Main simulation engine that orchestrates risk scenario execution
     """
     
+    # Scenario type -> simulation method
+    _DISPATCH = {
+        'data_breach': '_simulate_data_breach',
+        'ransomware': '_simulate_ransomware',
+        'service_disruption': '_simulate_service_disruption',
+        'supply_chain': '_simulate_supply_chain_compromise',
+        'multi_vendor': '_simulate_multi_vendor_failure',
+    }
+    
+    # Initial failure of a multi-vendor scenario; anything else is a service disruption
+    _INITIAL_FAILURE_DISPATCH = {
+        'data_breach': '_simulate_data_breach',
+        'ransomware': '_simulate_ransomware',
+    }
+    
     def __init__(self, simulation: Simulation):
         self.simulation = simulation
         self.vendor = simulation.target_vendor
@@ -25,24 +58,67 @@ class SimulationEngine:
         self.parameters = simulation.parameters
         self.config = settings.SIMULATION_CONFIG
         
-        # Results storage
+        # Results storage; money is kept as float and converted to Decimal on save
         self.results = {
-            'direct_costs': Decimal('0'),
-            'operational_costs': Decimal('0'),
-            'regulatory_costs': Decimal('0'),
-            'reputational_costs': Decimal('0'),
+            'direct_costs': 0.0,
+            'operational_costs': 0.0,
+            'regulatory_costs': 0.0,
+            'reputational_costs': 0.0,
             'downtime_hours': 0.0,
             'productivity_loss_percentage': 0.0,
             'customers_affected': 0,
             'estimated_recovery_time_hours': 0.0,
             'recovery_complexity': 'medium',
             'cascading_vendor_impacts': [],
-            'total_cascading_impact': Decimal('0'),
+            'total_cascading_impact': 0.0,
             'affected_process_ids': [],
             'impact_breakdown': {},
             'risk_score': 0.0
         }
     
+    @classmethod
+    def execute_batch(cls, simulation_ids, workers=None) -> List[Dict[str, Any]]:
+        """
+        Run independent simulations in separate processes, one engine per process.
+        Returns one {'simulation_id', 'status', 'result_id' or 'error'} dict per id,
+        in input order; a failing simulation does not stop the others.
+        Called from the run_simulations management command; not meant for web
+        processes. Workers are forked from this already set up process, so its
+        DB connections are closed first (outside any transaction) and each
+        worker opens its own; redis-py drops inherited connections by itself.
+        SQLite takes one writer at a time, so there (or with workers=1) the
+        batch runs in this process instead of queueing workers on its lock.
+        """
+        if workers == 1 or connections[DEFAULT_DB_ALIAS].vendor == 'sqlite':
+            return [_run_one(simulation_id) for simulation_id in simulation_ids]
+        if any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+            raise RuntimeError('execute_batch cannot run inside a transaction')
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context('fork'),
+            initializer=_init_batch_worker,
+        ) as executor:
+            return list(executor.map(_run_one, simulation_ids))
+    
+    @cached_property
+    def _affected_processes(self) -> List[Dict[str, Any]]:
+        """Processes of the organization depending on the vendor, fetched once per run"""
+        return list(BusinessProcess.objects.filter(
+            organization=self.organization,
+            dependent_vendors=self.vendor
+        ).values('id', 'hourly_operating_cost', 'criticality_level'))
+    
+    @cached_property
+    def _dependent_vendors(self) -> List[Vendor]:
+        """Vendors this vendor depends on, with just the columns the cascade reads"""
+        return list(self.vendor.dependent_vendors.only('id', 'name', 'contract_value', 'risk_level'))
+    
+    @cached_property
+    def _depending_vendors(self) -> List[Vendor]:
+        """Vendors that depend on this vendor, with just the columns the cascade reads"""
+        return list(self.vendor.dependency_of.only('id', 'name', 'contract_value', 'risk_level'))
+    
     def execute(self) -> SimulationResult:
         """
         Main execution method - The magic starts here! ✨
@@ -53,23 +129,15 @@ class SimulationEngine:
             # Update simulation status
             self.simulation.status = 'running'
             self.simulation.started_at = timezone.now()
-            self.simulation.save()
+            self.simulation.save(update_fields=['status', 'started_at', 'updated_at'])
             
             start_time = datetime.now()
             
             # Execute simulation based on scenario type
-            if self.scenario_type == 'data_breach':
-                self._simulate_data_breach()
-            elif self.scenario_type == 'ransomware':
-                self._simulate_ransomware()
-            elif self.scenario_type == 'service_disruption':
-                self._simulate_service_disruption()
-            elif self.scenario_type == 'supply_chain':
-                self._simulate_supply_chain_compromise()
-            elif self.scenario_type == 'multi_vendor':
-                self._simulate_multi_vendor_failure()
-            else:
+            handler = self._DISPATCH.get(self.scenario_type)
+            if not handler:
                 raise ValueError(f"Unknown scenario type: {self.scenario_type}")
+            getattr(self, handler)()
             
             # Calculate cascading impacts
             self._calculate_cascading_impacts()
@@ -89,7 +157,7 @@ class SimulationEngine:
             self.simulation.status = 'completed'
             self.simulation.completed_at = timezone.now()
             self.simulation.execution_time = execution_time
-            self.simulation.save()
+            self.simulation.save(update_fields=['status', 'completed_at', 'execution_time', 'updated_at'])
             
             logger.info(f"✅ Simulation completed in {execution_time:.2f}s")
             return result
@@ -98,7 +166,7 @@ class SimulationEngine:
             logger.error(f"❌ Simulation failed: {str(e)}", exc_info=True)
             self.simulation.status = 'failed'
             self.simulation.error_message = str(e)
-            self.simulation.save()
+            self.simulation.save(update_fields=['status', 'error_message', 'updated_at'])
             raise
     
     def _simulate_data_breach(self):
@@ -116,26 +184,26 @@ class SimulationEngine:
         
         # Calculate direct costs
         # Forensics, legal, notification
-        base_incident_cost = Decimal('50000')  # Base investigation cost
-        per_record_cost = Decimal(str(self.config['PER_RECORD_BREACH_COST']))
+        base_incident_cost = 50000.0  # Base investigation cost
+        per_record_cost = float(self.config['PER_RECORD_BREACH_COST'])
         
         self.results['direct_costs'] = (
             base_incident_cost + 
-            (Decimal(str(records_compromised)) * per_record_cost)
+            (records_compromised * per_record_cost)
         )
         
         # Calculate regulatory costs based on data types
-        regulatory_cost = Decimal('0')
+        regulatory_cost = 0.0
         
         if 'PII' in data_types or 'financial' in data_types:
             # GDPR penalties
-            gdpr_per_record = Decimal(str(self.config['GDPR_PENALTY_PER_RECORD']))
-            regulatory_cost += Decimal(str(records_compromised)) * gdpr_per_record
+            gdpr_per_record = float(self.config['GDPR_PENALTY_PER_RECORD'])
+            regulatory_cost += records_compromised * gdpr_per_record
         
         if 'healthcare' in data_types:
             # HIPAA penalties
-            hipaa_per_record = Decimal(str(self.config['HIPAA_PENALTY_PER_RECORD']))
-            regulatory_cost += Decimal(str(records_compromised)) * hipaa_per_record
+            hipaa_per_record = float(self.config['HIPAA_PENALTY_PER_RECORD'])
+            regulatory_cost += records_compromised * hipaa_per_record
         
         self.results['regulatory_costs'] = regulatory_cost
         
@@ -148,20 +216,16 @@ class SimulationEngine:
         customers_lost = int(customers_affected * churn_rate)
         
         # Average customer lifetime value (industry dependent)
-        avg_customer_value = Decimal('500')  # Could be parameterized
+        avg_customer_value = 500.0  # Could be parameterized
         
-        self.results['reputational_costs'] = (
-            Decimal(str(customers_lost)) * avg_customer_value
-        )
+        self.results['reputational_costs'] = customers_lost * avg_customer_value
         self.results['customers_affected'] = customers_affected
         
         # Operational costs (response time and recovery)
         response_hours = detection_time_hours + 48  # Detection + initial response
-        hourly_cost = Decimal('250')  # IT team hourly rate
+        hourly_cost = 250.0  # IT team hourly rate
         
-        self.results['operational_costs'] = (
-            Decimal(str(response_hours)) * hourly_cost
-        )
+        self.results['operational_costs'] = response_hours * hourly_cost
         
         # Downtime and recovery
         self.results['downtime_hours'] = float(response_hours * 0.3)  # 30% downtime
@@ -171,11 +235,7 @@ class SimulationEngine:
         self.results['recovery_complexity'] = 'high' if records_compromised > 50000 else 'medium'
         
         # Affected processes (processes that use this vendor)
-        affected_processes = BusinessProcess.objects.filter(
-            organization=self.organization,
-            dependent_vendors=self.vendor
-        )
-        self.results['affected_process_ids'] = [p.id for p in affected_processes]
+        self.results['affected_process_ids'] = [p['id'] for p in self._affected_processes]
         
         # Impact breakdown
         self.results['impact_breakdown'] = {
@@ -186,10 +246,10 @@ class SimulationEngine:
                 'breach_vector': breach_vector,
             },
             'cost_breakdown': {
-                'investigation': float(base_incident_cost),
-                'per_record_cost': float(per_record_cost),
-                'notification_costs': float(per_record_cost * Decimal(str(records_compromised)) * Decimal('0.3')),
-                'legal_costs': float(base_incident_cost * Decimal('0.5')),
+                'investigation': base_incident_cost,
+                'per_record_cost': per_record_cost,
+                'notification_costs': per_record_cost * records_compromised * 0.3,
+                'legal_costs': base_incident_cost * 0.5,
             },
             'customer_impact': {
                 'customers_affected': customers_affected,
@@ -208,7 +268,7 @@ class SimulationEngine:
         logger.info("🔒 Simulating ransomware attack")
         
         # Get parameters
-        ransom_amount = Decimal(str(self.parameters.get('ransom_amount', 500000)))
+        ransom_amount = float(self.parameters.get('ransom_amount', 500000))
         downtime_hours = self.parameters.get('downtime_hours', 168)  # 1 week
         encryption_scope = self.parameters.get('encryption_scope', 'full')
         backup_available = self.parameters.get('backup_available', True)
@@ -217,28 +277,20 @@ class SimulationEngine:
         if not backup_available:
             # May need to pay ransom or lose data
             ransom_payment_probability = 0.3
-            self.results['direct_costs'] = ransom_amount * Decimal(str(ransom_payment_probability))
+            self.results['direct_costs'] = ransom_amount * ransom_payment_probability
         else:
             # Restoration costs
-            self.results['direct_costs'] = Decimal('100000')  # Restoration and cleanup
+            self.results['direct_costs'] = 100000.0  # Restoration and cleanup
         
         # Operational costs - MASSIVE impact
-        affected_processes = BusinessProcess.objects.filter(
-            organization=self.organization,
-            dependent_vendors=self.vendor
-        )
+        affected_processes = self._affected_processes
         
-        total_hourly_cost = sum(
-            float(p.hourly_operating_cost) 
-            for p in affected_processes
-        )
+        total_hourly_cost = sum(float(p['hourly_operating_cost']) for p in affected_processes)
         
         scope_multiplier = 1.0 if encryption_scope == 'full' else 0.5
         
         self.results['operational_costs'] = (
-            Decimal(str(total_hourly_cost)) * 
-            Decimal(str(downtime_hours)) * 
-            Decimal(str(scope_multiplier))
+            total_hourly_cost * downtime_hours * scope_multiplier
         )
         
         # Downtime
@@ -260,20 +312,20 @@ class SimulationEngine:
         self.results['recovery_complexity'] = 'very_high' if not backup_available else 'high'
         
         # Affected processes
-        self.results['affected_process_ids'] = [p.id for p in affected_processes]
+        self.results['affected_process_ids'] = [p['id'] for p in affected_processes]
         
         # Regulatory costs (if data potentially compromised)
         if not backup_available:
-            self.results['regulatory_costs'] = Decimal('250000')  # Potential data loss notifications
+            self.results['regulatory_costs'] = 250000.0  # Potential data loss notifications
         
         # Reputational costs
         # Ransomware attacks damage reputation significantly
-        self.results['reputational_costs'] = Decimal('500000')
+        self.results['reputational_costs'] = 500000.0
         
         # Impact breakdown
         self.results['impact_breakdown'] = {
             'ransomware_details': {
-                'ransom_demanded': float(ransom_amount),
+                'ransom_demanded': ransom_amount,
                 'downtime_hours': downtime_hours,
                 'encryption_scope': encryption_scope,
                 'backup_available': backup_available,
@@ -297,29 +349,21 @@ class SimulationEngine:
         customer_impact_percentage = self.parameters.get('customer_impact_percentage', 50)
         
         # Operational costs based on affected processes
-        affected_processes = BusinessProcess.objects.filter(
-            organization=self.organization,
-            dependent_vendors=self.vendor
-        )
+        affected_processes = self._affected_processes
         
-        # Calculate based on criticality
-        total_impact = Decimal('0')
-        for process in affected_processes:
-            # Higher criticality = higher impact
-            criticality_multiplier = Decimal(str(process.criticality_level / 5.0))
-            process_impact = (
-                process.hourly_operating_cost * 
-                Decimal(str(duration_hours)) * 
-                criticality_multiplier
-            )
-            total_impact += process_impact
+        # Calculate based on criticality; higher criticality = higher impact
+        weighted_hourly_cost = sum(
+            float(p['hourly_operating_cost']) * p['criticality_level']
+            for p in affected_processes
+        )
+        total_impact = weighted_hourly_cost / 5.0 * duration_hours
         
         self.results['operational_costs'] = total_impact
         
         # Direct costs (investigation and remediation)
-        base_cost = Decimal('25000')
+        base_cost = 25000.0
         complexity_multiplier = 1.5 if disruption_cause == 'cyber_attack' else 1.0
-        self.results['direct_costs'] = base_cost * Decimal(str(complexity_multiplier))
+        self.results['direct_costs'] = base_cost * complexity_multiplier
         
         # Downtime
         self.results['downtime_hours'] = float(duration_hours)
@@ -332,19 +376,19 @@ class SimulationEngine:
         self.results['recovery_complexity'] = 'medium'
         
         # SLA penalties (if applicable)
-        sla_penalty = Decimal(str(self.vendor.contract_value)) * Decimal('0.05')  # 5% penalty
+        sla_penalty = float(self.vendor.contract_value) * 0.05  # 5% penalty
         self.results['regulatory_costs'] = sla_penalty
         
         # Customer impact
         if customer_impact_percentage > 70:
-            self.results['reputational_costs'] = Decimal('200000')
+            self.results['reputational_costs'] = 200000.0
         elif customer_impact_percentage > 40:
-            self.results['reputational_costs'] = Decimal('100000')
+            self.results['reputational_costs'] = 100000.0
         else:
-            self.results['reputational_costs'] = Decimal('50000')
+            self.results['reputational_costs'] = 50000.0
         
         # Affected processes
-        self.results['affected_process_ids'] = [p.id for p in affected_processes]
+        self.results['affected_process_ids'] = [p['id'] for p in affected_processes]
         
         # Impact breakdown
         self.results['impact_breakdown'] = {
@@ -353,8 +397,8 @@ class SimulationEngine:
                 'cause': disruption_cause,
                 'customer_impact_percentage': customer_impact_percentage,
             },
-            'sla_penalty': float(sla_penalty),
-            'affected_process_count': affected_processes.count(),
+            'sla_penalty': sla_penalty,
+            'affected_process_count': len(self.results['affected_process_ids']),
         }
         
         logger.info(f"⚠️ Service disruption: {duration_hours}h, ${total_impact}")
@@ -374,20 +418,20 @@ class SimulationEngine:
         # This is SEVERE - affects the vendor and all their customers
         
         # Direct costs - massive investigation
-        base_cost = Decimal('1000000')  # Million dollar investigation
+        base_cost = 1000000.0  # Million dollar investigation
         self.results['direct_costs'] = base_cost
         
         # Impact on YOUR organization as a customer
         # Code review, system rebuilds, incident response
-        self.results['operational_costs'] = Decimal('500000')
+        self.results['operational_costs'] = 500000.0
         
         # Regulatory costs - notification requirements
         # Even though you're the victim, you may have obligations
-        self.results['regulatory_costs'] = Decimal('300000')
+        self.results['regulatory_costs'] = 300000.0
         
         # Reputational costs - HUGE
         # Your organization used compromised vendor
-        self.results['reputational_costs'] = Decimal('2000000')
+        self.results['reputational_costs'] = 2000000.0
         
         # Long detection time = long exposure
         exposure_hours = detection_delay_days * 24
@@ -400,11 +444,7 @@ class SimulationEngine:
         self.results['recovery_complexity'] = 'very_high'
         
         # ALL processes potentially affected
-        affected_processes = BusinessProcess.objects.filter(
-            organization=self.organization,
-            dependent_vendors=self.vendor
-        )
-        self.results['affected_process_ids'] = [p.id for p in affected_processes]
+        self.results['affected_process_ids'] = [p['id'] for p in self._affected_processes]
         
         # Impact breakdown
         self.results['impact_breakdown'] = {
@@ -424,7 +464,7 @@ class SimulationEngine:
             'severity': 'CRITICAL',
         }
         
-        logger.info(f"🔗 Supply chain compromise: {detection_delay_days} days undetected, ${base_cost + Decimal('500000')}")
+        logger.info(f"🔗 Supply chain compromise: {detection_delay_days} days undetected, ${base_cost + 500000.0}")
     
     def _simulate_multi_vendor_failure(self):
         """
@@ -439,12 +479,9 @@ class SimulationEngine:
         
         # Start with initial vendor failure
         # Simulate the initial failure type
-        if initial_failure_type == 'data_breach':
-            self._simulate_data_breach()
-        elif initial_failure_type == 'ransomware':
-            self._simulate_ransomware()
-        else:
-            self._simulate_service_disruption()
+        getattr(self, self._INITIAL_FAILURE_DISPATCH.get(
+            initial_failure_type, '_simulate_service_disruption'
+        ))()
         
         # Store initial impact
         initial_impact = (
@@ -457,43 +494,32 @@ class SimulationEngine:
         # Now calculate cascading impacts
         cascade_impacts = []
         
-        # Get dependent vendors
-        dependent_vendors = self.vendor.dependent_vendors.all()
-        
-        for dep_vendor in dependent_vendors:
-            # Probability this vendor is also affected
-            import random
-            if random.random() < cascade_probability:
-                # This vendor is affected - calculate impact
-                vendor_impact = self._calculate_vendor_cascade_impact(dep_vendor)
-                cascade_impacts.append({
-                    'vendor_id': str(dep_vendor.id),
-                    'vendor_name': dep_vendor.name,
-                    'impact': float(vendor_impact),
-                    'reason': 'dependency_failure'
-                })
-        
-        # Vendors that depend on THIS vendor
-        depending_vendors = self.vendor.dependency_of.all()
-        
-        for dep_vendor in depending_vendors:
-            if random.random() < cascade_probability * 0.8:  # Slightly lower probability
-                vendor_impact = self._calculate_vendor_cascade_impact(dep_vendor)
-                cascade_impacts.append({
-                    'vendor_id': str(dep_vendor.id),
-                    'vendor_name': dep_vendor.name,
-                    'impact': float(vendor_impact),
-                    'reason': 'upstream_failure'
-                })
+        # Vendors this vendor depends on, and vendors that depend on THIS vendor
+        # (slightly lower probability); each vendor's draw decides if it is also affected
+        for vendors, probability, reason in (
+            (self._dependent_vendors, cascade_probability, 'dependency_failure'),
+            (self._depending_vendors, cascade_probability * 0.8, 'upstream_failure'),
+        ):
+            affected = np.flatnonzero(np.random.random(len(vendors)) < probability)
+            impacts = self._calculate_vendor_cascade_impacts(vendors)
+            cascade_impacts.extend(
+                {
+                    'vendor_id': str(vendors[i].id),
+                    'vendor_name': vendors[i].name,
+                    'impact': float(impacts[i]),
+                    'reason': reason
+                }
+                for i in affected
+            )
         
         # Calculate total cascading impact
-        total_cascade = sum(Decimal(str(c['impact'])) for c in cascade_impacts)
+        total_cascade = sum(c['impact'] for c in cascade_impacts)
         
         self.results['cascading_vendor_impacts'] = cascade_impacts
         self.results['total_cascading_impact'] = total_cascade
         
         # Multiply all costs by cascade factor
-        cascade_multiplier = Decimal('1.5')
+        cascade_multiplier = 1.5
         self.results['direct_costs'] *= cascade_multiplier
         self.results['operational_costs'] *= cascade_multiplier
         self.results['recovery_complexity'] = 'very_high'
@@ -501,31 +527,25 @@ class SimulationEngine:
         # Impact breakdown
         self.results['impact_breakdown']['cascade_analysis'] = {
             'initial_failure': initial_failure_type,
-            'initial_impact': float(initial_impact),
+            'initial_impact': initial_impact,
             'cascade_probability': cascade_probability,
             'vendors_affected': len(cascade_impacts),
-            'total_cascade_impact': float(total_cascade),
-            'cascade_multiplier': float(cascade_multiplier),
+            'total_cascade_impact': total_cascade,
+            'cascade_multiplier': cascade_multiplier,
         }
         
         logger.info(f"⛓️ Multi-vendor failure: {len(cascade_impacts)} vendors affected, total: ${initial_impact + total_cascade}")
     
-    def _calculate_vendor_cascade_impact(self, vendor: Vendor) -> Decimal:
-        """Calculate impact of cascade on a dependent vendor"""
-        # Base impact on vendor's contract value and criticality
-        base_impact = vendor.contract_value * Decimal('0.2')  # 20% of contract value
-        
-        # Adjust by vendor risk level
-        risk_multipliers = {
-            'low': Decimal('0.5'),
-            'medium': Decimal('1.0'),
-            'high': Decimal('1.5'),
-            'critical': Decimal('2.0'),
-        }
-        
-        multiplier = risk_multipliers.get(vendor.risk_level, Decimal('1.0'))
-        
-        return base_impact * multiplier
+    def _calculate_vendor_cascade_impacts(self, vendors: List[Vendor]) -> np.ndarray:
+        """Calculate impact of cascade on each of the given vendors in one array pass"""
+        count = len(vendors)
+        contract_values = np.fromiter((float(v.contract_value) for v in vendors), dtype=float, count=count)
+        multipliers = np.fromiter(
+            (CASCADE_RISK_MULTIPLIERS.get(v.risk_level, 1.0) for v in vendors),
+            dtype=float, count=count
+        )
+        # Base impact is 20% of contract value, adjusted by vendor risk level
+        return contract_values * 0.2 * multipliers
     
     def _calculate_cascading_impacts(self):
         """
@@ -537,24 +557,22 @@ class SimulationEngine:
         
         logger.info("🌊 Calculating cascading impacts")
         
-        cascade_impacts = []
-        
         # Check vendor dependencies
-        dependent_vendors = self.vendor.dependent_vendors.all()
+        dependent_vendors = self._dependent_vendors
+        impacts = self._calculate_vendor_cascade_impacts(dependent_vendors)
         
-        for dep_vendor in dependent_vendors:
-            # Impact based on dependency strength
-            impact = self._calculate_vendor_cascade_impact(dep_vendor)
-            
-            cascade_impacts.append({
+        cascade_impacts = [
+            {
                 'vendor_id': str(dep_vendor.id),
                 'vendor_name': dep_vendor.name,
-                'impact': float(impact),
+                'impact': impact,
                 'reason': 'direct_dependency'
-            })
+            }
+            for dep_vendor, impact in zip(dependent_vendors, impacts.tolist())
+        ]
         
         # Calculate total
-        total_cascade = sum(Decimal(str(c['impact'])) for c in cascade_impacts)
+        total_cascade = sum(c['impact'] for c in cascade_impacts)
         
         self.results['cascading_vendor_impacts'] = cascade_impacts
         self.results['total_cascading_impact'] = total_cascade
@@ -577,7 +595,6 @@ class SimulationEngine:
         
         # Use logarithmic scale for financial impact
         # $100K = 50, $1M = 75, $10M = 90, $100M = 100
-        import math
         if total_financial > 0:
             financial_score = min(100, 30 + (20 * math.log10(float(total_financial) / 100000)))
         else:
@@ -612,10 +629,7 @@ class SimulationEngine:
         """
         logger.info(f"🎲 Running Monte Carlo simulation ({self.simulation.monte_carlo_iterations} iterations)")
         
-        import numpy as np
-        
         iterations = self.simulation.monte_carlo_iterations
-        results_distribution = []
         
         # Store current results as baseline
         baseline_total = (
@@ -625,41 +639,38 @@ class SimulationEngine:
             self.results['reputational_costs']
         )
         
-        # Run iterations with varying parameters
-        for i in range(iterations):
-            # Vary costs by ±30% using normal distribution
-            variation = np.random.normal(1.0, 0.15)  # Mean 1.0, std 0.15
-            variation = max(0.7, min(1.3, variation))  # Clip to ±30%
-            
-            iteration_total = float(baseline_total) * variation
-            results_distribution.append(iteration_total)
+        # Draw every iteration's variation at once: normal(mean 1.0, std 0.15), clipped to ±30%
+        variations = np.clip(np.random.normal(1.0, 0.15, size=iterations), 0.7, 1.3)
+        results_array = float(baseline_total) * variations
         
-        # Calculate statistics
-        results_array = np.array(results_distribution)
+        # Calculate statistics; all percentiles from a single partition of the array
+        p2_5, p5, p50, p75, p90, p95, p97_5, p99 = np.percentile(
+            results_array, [2.5, 5, 50, 75, 90, 95, 97.5, 99]
+        ).tolist()
         
         monte_carlo_results = {
             'iterations': iterations,
-            'mean': float(np.mean(results_array)),
-            'median': float(np.median(results_array)),
-            'std_dev': float(np.std(results_array)),
-            'min': float(np.min(results_array)),
-            'max': float(np.max(results_array)),
-            'percentile_50': float(np.percentile(results_array, 50)),
-            'percentile_75': float(np.percentile(results_array, 75)),
-            'percentile_90': float(np.percentile(results_array, 90)),
-            'percentile_95': float(np.percentile(results_array, 95)),
-            'percentile_99': float(np.percentile(results_array, 99)),
+            'mean': float(results_array.mean()),
+            'median': p50,
+            'std_dev': float(results_array.std()),
+            'min': float(results_array.min()),
+            'max': float(results_array.max()),
+            'percentile_50': p50,
+            'percentile_75': p75,
+            'percentile_90': p90,
+            'percentile_95': p95,
+            'percentile_99': p99,
             'confidence_intervals': {
                 '90': {
-                    'lower': float(np.percentile(results_array, 5)),
-                    'upper': float(np.percentile(results_array, 95)),
+                    'lower': p5,
+                    'upper': p95,
                 },
                 '95': {
-                    'lower': float(np.percentile(results_array, 2.5)),
-                    'upper': float(np.percentile(results_array, 97.5)),
+                    'lower': p2_5,
+                    'upper': p97_5,
                 }
             },
-            'distribution': results_distribution[:100]  # Store first 100 for visualization
+            'distribution': results_array[:100].tolist()  # Store first 100 for visualization
         }
         
         self.results['monte_carlo_results'] = monte_carlo_results
@@ -687,28 +698,56 @@ class SimulationEngine:
         result, created = SimulationResult.objects.update_or_create(
             simulation=self.simulation,
             defaults={
-                'direct_costs': self.results['direct_costs'],
-                'operational_costs': self.results['operational_costs'],
-                'regulatory_costs': self.results['regulatory_costs'],
-                'reputational_costs': self.results['reputational_costs'],
-                'total_financial_impact': total_impact,
+                'direct_costs': _to_money(self.results['direct_costs']),
+                'operational_costs': _to_money(self.results['operational_costs']),
+                'regulatory_costs': _to_money(self.results['regulatory_costs']),
+                'reputational_costs': _to_money(self.results['reputational_costs']),
+                'total_financial_impact': _to_money(total_impact),
                 'downtime_hours': self.results['downtime_hours'],
                 'productivity_loss_percentage': self.results['productivity_loss_percentage'],
                 'customers_affected': self.results['customers_affected'],
                 'estimated_recovery_time_hours': self.results['estimated_recovery_time_hours'],
                 'recovery_complexity': self.results['recovery_complexity'],
                 'cascading_vendor_impacts': self.results['cascading_vendor_impacts'],
-                'total_cascading_impact': self.results['total_cascading_impact'],
+                'total_cascading_impact': _to_money(self.results['total_cascading_impact']),
                 'impact_breakdown': self.results['impact_breakdown'],
                 'risk_score': self.results['risk_score'],
                 'monte_carlo_results': self.results.get('monte_carlo_results', {}),
             }
         )
         
-        # Link affected processes
-        if self.results['affected_process_ids']:
-            result.affected_processes.set(self.results['affected_process_ids'])
+        # Link affected processes; re-runs only touch the rows that changed
+        desired = set(self.results['affected_process_ids'])
+        current = set() if created else set(result.affected_processes.values_list('id', flat=True))
+        if desired - current:
+            result.affected_processes.add(*(desired - current))
+        if current - desired:
+            result.affected_processes.remove(*(current - desired))
         
         logger.info(f"💾 Results saved: Total impact ${total_impact:,.2f}")
         
-        return result
\ No newline at end of file
+        return result
+
+
+def _init_batch_worker():
+    """
+    Forget any DB connection handles inherited through the fork. They are
+    dropped, not closed: closing would end the parent's session on the server.
+    """
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+
+
+def _run_one(simulation_id):
+    """Worker for SimulationEngine.execute_batch; runs one simulation by id"""
+    try:
+        simulation = Simulation.objects.select_related(
+            'target_vendor', 'organization', 'scenario_template'
+        ).get(id=simulation_id)
+        result = SimulationEngine(simulation).execute()
+    except Exception as e:
+        # execute() has already logged engine errors and marked the simulation failed
+        if isinstance(e, Simulation.DoesNotExist):
+            logger.error(f"Batch simulation {simulation_id} not found")
+        return {'simulation_id': str(simulation_id), 'status': 'failed', 'error': str(e)}
+    return {'simulation_id': str(simulation_id), 'status': 'completed', 'result_id': str(result.id)}
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from simulations.engine import SimulationEngine
+from simulations.models import Simulation
+
+
+class Command(BaseCommand):
+    help = 'Run simulations in parallel worker processes (all pending ones by default)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'simulation_ids', nargs='*',
+            help='Simulations to run; defaults to every pending simulation'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Number of worker processes (default: one per CPU)'
+        )
+
+    def handle(self, *args, **options):
+        simulation_ids = options['simulation_ids'] or [
+            str(simulation_id)
+            for simulation_id in Simulation.objects.filter(status='pending').values_list('id', flat=True)
+        ]
+        if not simulation_ids:
+            self.stdout.write(self.style.WARNING('No simulations to run'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'Running {len(simulation_ids)} simulations...'))
+        outcomes = SimulationEngine.execute_batch(simulation_ids, workers=options['workers'])
+
+        failed_count = 0
+        for outcome in outcomes:
+            if outcome['status'] == 'completed':
+                self.stdout.write(self.style.SUCCESS(f' Completed: {outcome["simulation_id"]}'))
+            else:
+                failed_count += 1
+                self.stdout.write(self.style.ERROR(f' Failed: {outcome["simulation_id"]} ({outcome["error"]})'))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n Batch complete! Completed: {len(outcomes) - failed_count}, Failed: {failed_count}'
+            )
+        )
@@ -1,4 +1,6 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 from simulations.models import ScenarioTemplate
 
 
@@ -140,34 +142,42 @@ class Command(BaseCommand):
             }
         ]
 
-        created_count = 0
-        updated_count = 0
+        # One lookup for every template, then one INSERT and one UPDATE batch
+        existing = ScenarioTemplate.objects.in_bulk(
+            [template_data['scenario_type'] for template_data in templates],
+            field_name='scenario_type'
+        )
+        now = timezone.now()
+        to_create = []
+        to_update = []
 
         for template_data in templates:
-            scenario_type = template_data['scenario_type']
-            
-            # Check if template already exists
-            existing_template = ScenarioTemplate.objects.filter(
-                scenario_type=scenario_type
-            ).first()
+            existing_template = existing.get(template_data['scenario_type'])
 
             if existing_template:
-                # Update existing template
+                # Update existing template; bulk_update does not apply auto_now
                 for key, value in template_data.items():
                     setattr(existing_template, key, value)
-                existing_template.save()
-                updated_count += 1
+                existing_template.updated_at = now
+                to_update.append(existing_template)
                 self.stdout.write(
                     self.style.SUCCESS(f' Updated: {template_data["name"]}')
                 )
             else:
                 # Create new template
-                ScenarioTemplate.objects.create(**template_data)
-                created_count += 1
+                to_create.append(ScenarioTemplate(**template_data))
                 self.stdout.write(
                     self.style.SUCCESS(f' Created: {template_data["name"]}')
                 )
 
+        update_fields = sorted({key for template_data in templates for key in template_data} - {'scenario_type'})
+        with transaction.atomic():
+            ScenarioTemplate.objects.bulk_create(to_create)
+            if to_update:
+                ScenarioTemplate.objects.bulk_update(to_update, update_fields + ['updated_at'])
+        created_count = len(to_create)
+        updated_count = len(to_update)
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'\n Seeding complete! Created: {created_count}, Updated: {updated_count}'
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulations', '0002_seed_scenario_templates'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='simulation',
+            name='simulations_organiz_e44f02_idx',
+        ),
+        migrations.AddIndex(
+            model_name='simulation',
+            index=models.Index(fields=['organization', 'status', '-completed_at'], name='sim_org_status_completed'),
+        ),
+    ]
@@ -198,7 +198,11 @@ class Simulation(models.Model):
         verbose_name = 'Simulation'
         verbose_name_plural = 'Simulations'
         indexes = [
-            models.Index(fields=['organization', 'status']),
+            # Also serves (organization, status) lookups; the dashboard lists newest completions
+            models.Index(
+                fields=['organization', 'status', '-completed_at'],
+                name='sim_org_status_completed'
+            ),
             models.Index(fields=['target_vendor', 'created_at']),
         ]
     
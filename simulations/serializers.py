@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db import models
+from django.db.models import prefetch_related_objects
 from .models import (
     BusinessProcess, ScenarioTemplate, Simulation,
     SimulationResult, SimulationScenario, SimulationComparison
@@ -7,6 +9,22 @@ from vendors.serializers import VendorListSerializer
 from core.models import UserProfile
 from django.shortcuts import get_object_or_404
 
+
+class PrefetchingListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that loads the relations named in the child's
+    Meta.list_prefetch_related for the whole list at once. Relations the
+    caller already select_related/prefetched are skipped.
+    """
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = list(iterable)
+        if instances and isinstance(instances[0], models.Model):
+            prefetch_related_objects(instances, *self.child.Meta.list_prefetch_related)
+        return super().to_representation(instances)
+
+
 class BusinessProcessSerializer(serializers.ModelSerializer):
     """Serializer for BusinessProcess"""
     dependent_vendor_names = serializers.SerializerMethodField()
@@ -148,6 +166,8 @@ class SimulationListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Simulation
+        list_serializer_class = PrefetchingListSerializer
+        list_prefetch_related = ['scenario_template', 'target_vendor', 'created_by', 'result']
         fields = [
             'id', 'name', 'scenario_name', 'vendor_name',
             'status', 'status_display', 'created_by', 'created_by_name',
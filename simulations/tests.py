@@ -1,3 +1,221 @@
-from django.test import TestCase
+import math
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from Account.models import CustomUser
+from core.models import Organization
+from vendors.models import Vendor
+from .engine import SimulationEngine, _run_one
+from .models import ScenarioTemplate, Simulation, SimulationResult
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class SeedScenarioTemplatesTests(TestCase):
+    def seed(self):
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('seed_scenario_templates', stdout=out)
+        statements = [query['sql'].split(None, 1)[0].upper() for query in queries]
+        return out.getvalue(), statements
+
+    def test_missing_templates_are_created_and_others_refreshed(self):
+        ScenarioTemplate.objects.filter(scenario_type='ransomware').delete()
+        ScenarioTemplate.objects.filter(scenario_type='data_breach').update(name='Renamed', is_active=False)
+
+        output, statements = self.seed()
+
+        self.assertIn('Created: 1, Updated: 4', output)
+        self.assertTrue(ScenarioTemplate.objects.filter(scenario_type='ransomware').exists())
+        data_breach = ScenarioTemplate.objects.get(scenario_type='data_breach')
+        self.assertEqual(data_breach.name, 'Data Breach Simulation')
+        self.assertTrue(data_breach.is_active)
+        # One lookup, one INSERT and one UPDATE however many templates there are
+        self.assertEqual(statements.count('SELECT'), 1)
+        self.assertEqual(statements.count('INSERT'), 1)
+        self.assertEqual(statements.count('UPDATE'), 1)
+
+    def test_rerun_only_updates(self):
+        self.seed()
+        output, statements = self.seed()
+        self.assertIn('Created: 0, Updated: 5', output)
+        self.assertEqual(ScenarioTemplate.objects.count(), 5)
+        self.assertNotIn('INSERT', statements)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SimulationTestCase(TestCase):
+    """Organization with an admin user, one vendor and a scenario template"""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(
+            name='Acme', industry='Finance', size='Medium', country='US'
+        )
+        self.user = CustomUser.objects.create_user(
+            email='admin@example.com', password='pass12345', first_name='Ada', last_name='Admin'
+        )
+        profile = self.user.profile
+        profile.organization = self.organization
+        profile.role = 'admin'
+        profile.save()
+        self.vendor = Vendor.objects.create(
+            organization=self.organization,
+            name='Cloudy',
+            industry='Technology',
+            country='US',
+            contact_name='Contact',
+            contact_email='contact@example.com',
+            services_provided='Hosting',
+            contract_start_date=date(2026, 1, 1),
+            contract_end_date=date(2027, 1, 1),
+            contract_value=Decimal('100000.00'),
+        )
+        self.template, _ = ScenarioTemplate.objects.get_or_create(
+            scenario_type='data_breach',
+            defaults={'name': 'Data Breach', 'description': 'Data breach'}
+        )
+        self.client = APIClient()
+
+    def create_simulations(self, count, with_results=True):
+        simulations = []
+        for i in range(count):
+            simulation = Simulation.objects.create(
+                organization=self.organization,
+                created_by=self.user,
+                name=f'Simulation {i}',
+                scenario_template=self.template,
+                target_vendor=self.vendor,
+            )
+            if with_results:
+                SimulationResult.objects.create(simulation=simulation)
+            simulations.append(simulation)
+        return simulations
+
+
+class SimulationListQueryCountTests(SimulationTestCase):
+    def count_queries(self):
+        self.client.force_authenticate(CustomUser.objects.get(pk=self.user.pk))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('simulations:simulation-list-create'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.create_simulations(2)
+        self.create_simulations(1, with_results=False)
+        few, _ = self.count_queries()
+        self.create_simulations(8)
+        many, response = self.count_queries()
+        self.assertEqual(few, many)
+
+        rows = response.data
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(sum(row['has_results'] for row in rows), 10)
+        self.assertEqual({row['vendor_name'] for row in rows}, {'Cloudy'})
+        self.assertEqual({row['created_by_name'] for row in rows}, {'Ada Admin'})
+
+
+class BatchExecutionTests(SimulationTestCase):
+    missing_ids = ['00000000-0000-0000-0000-000000000001', '00000000-0000-0000-0000-000000000002']
+
+    def test_missing_simulation_is_reported_as_failed(self):
+        outcome = _run_one(self.missing_ids[0])
+        self.assertEqual(outcome['simulation_id'], self.missing_ids[0])
+        self.assertEqual(outcome['status'], 'failed')
+        self.assertIn('error', outcome)
+
+    def test_sqlite_batch_runs_in_process_in_input_order(self):
+        with mock.patch('simulations.engine.ProcessPoolExecutor') as pool:
+            outcomes = SimulationEngine.execute_batch(self.missing_ids)
+        pool.assert_not_called()
+        self.assertEqual([outcome['simulation_id'] for outcome in outcomes], self.missing_ids)
+        self.assertEqual({outcome['status'] for outcome in outcomes}, {'failed'})
+
+    def test_batch_refuses_to_fork_inside_a_transaction(self):
+        # TestCase wraps each test in a transaction
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            with self.assertRaises(RuntimeError):
+                SimulationEngine.execute_batch(self.missing_ids)
+
+    def test_command_reports_each_simulation(self):
+        out = StringIO()
+        call_command('run_simulations', *self.missing_ids, stdout=out)
+        output = out.getvalue()
+        for simulation_id in self.missing_ids:
+            self.assertIn(f'Failed: {simulation_id}', output)
+        self.assertIn('Completed: 0, Failed: 2', output)
+
+    def test_command_without_pending_simulations(self):
+        self.create_simulations(1, with_results=False)
+        Simulation.objects.update(status='completed')
+        out = StringIO()
+        call_command('run_simulations', stdout=out)
+        self.assertIn('No simulations to run', out.getvalue())
+
+
+class MonteCarloTests(TestCase):
+    """Statistics must match the same draws taken as one NumPy array"""
+
+    costs = {
+        'direct_costs': 120000.0,
+        'operational_costs': 45000.0,
+        'regulatory_costs': 30000.0,
+        'reputational_costs': 5000.0,
+    }
+
+    def run_monte_carlo(self, iterations):
+        engine = SimulationEngine.__new__(SimulationEngine)
+        engine.simulation = SimpleNamespace(monte_carlo_iterations=iterations)
+        engine.results = dict(self.costs)
+
+        draws = []
+        real_normal = np.random.normal
+
+        def recording_normal(*args, **kwargs):
+            values = real_normal(*args, **kwargs)
+            draws.append(values)
+            return values
+
+        np.random.seed(1234)
+        with mock.patch('simulations.engine.np.random.normal', side_effect=recording_normal):
+            engine._run_monte_carlo_simulation()
+
+        # A single pass draws every iteration at once
+        self.assertEqual(len(draws), 1)
+        full = float(sum(self.costs.values())) * np.clip(draws[0], 0.7, 1.3)
+        self.assertEqual(full.size, iterations)
+        return engine.results['monte_carlo_results'], full
+
+    def test_statistics_are_exact(self):
+        for iterations in (5000, 10000):
+            with self.subTest(iterations=iterations):
+                results, full = self.run_monte_carlo(iterations)
+                self.assertTrue(math.isclose(results['mean'], float(full.mean()), rel_tol=1e-12))
+                self.assertTrue(math.isclose(results['std_dev'], float(full.std()), rel_tol=1e-12))
+                self.assertEqual(results['min'], float(full.min()))
+                self.assertEqual(results['max'], float(full.max()))
+
+                expected = np.percentile(full, [2.5, 5, 50, 75, 90, 95, 97.5, 99])
+                self.assertEqual(results['confidence_intervals']['95']['lower'], expected[0])
+                self.assertEqual(results['confidence_intervals']['90']['lower'], expected[1])
+                self.assertEqual(results['median'], expected[2])
+                self.assertEqual(results['percentile_75'], expected[3])
+                self.assertEqual(results['percentile_90'], expected[4])
+                self.assertEqual(results['percentile_95'], expected[5])
+                self.assertEqual(results['confidence_intervals']['95']['upper'], expected[6])
+                self.assertEqual(results['percentile_99'], expected[7])
+                self.assertEqual(results['distribution'], full[:100].tolist())
@@ -23,7 +23,7 @@ from .serializers import (
     SimulationSummarySerializer, MonteCarloResultSerializer,
     BatchSimulationSerializer
 )
-from core.models import UserProfile
+from core.models import UserProfile, clear_dashboard_cache
 from drf_yasg.utils import swagger_auto_schema
 import logging
 
@@ -544,6 +544,7 @@ def simulation_detail(request, simulation_id):
             )
         
         simulation.delete()
+        clear_dashboard_cache(profile.organization_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
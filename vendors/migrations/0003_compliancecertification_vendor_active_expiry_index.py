@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-16 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0002_alter_compliancecertification_certificate_file_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='compliancecertification',
+            name='compliance__vendor__fc326a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='compliancecertification',
+            index=models.Index(fields=['vendor', 'is_active', 'expiry_date'], name='cert_vendor_active_expiry'),
+        ),
+    ]
@@ -289,7 +289,11 @@ class ComplianceCertification(models.Model):
         verbose_name = 'Certification'
         verbose_name_plural = 'Compliance Certifications'
         indexes = [
-            models.Index(fields=['vendor', 'is_active']),
+            # Also serves (vendor, is_active) lookups; adds the expiry range for the stats view
+            models.Index(
+                fields=['vendor', 'is_active', 'expiry_date'],
+                name='cert_vendor_active_expiry'
+            ),
             models.Index(fields=['expiry_date']),
         ]
     
@@ -348,4 +352,13 @@ class VendorContact(models.Model):
         verbose_name_plural = 'Vendor Contacts'
     
     def __str__(self):
-        return f"{self.name} ({self.get_contact_type_display()}) - {self.vendor.name}"
\ No newline at end of file
+        return f"{self.name} ({self.get_contact_type_display()}) - {self.vendor.name}"
+
+def vendor_organization_id(instance):
+    """
+    Organization id of instance.vendor, taken from the loaded vendor when
+    there is one, otherwise read by vendor_id without loading the vendor
+    """
+    if instance._meta.get_field('vendor').is_cached(instance):
+        return instance.vendor.organization_id
+    return Vendor.objects.filter(pk=instance.vendor_id).values_list('organization_id', flat=True).first()
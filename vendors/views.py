@@ -17,7 +17,8 @@ from .serializers import (
     ComplianceCertificationSerializer, CertificationStatusSerializer,
     VendorContactSerializer, CompareVendorsSerializer
 )
-from core.models import UserProfile
+from core.models import UserProfile, clear_dashboard_cache
+from assessments.models import clear_assessment_summary_cache
 from drf_yasg.utils import swagger_auto_schema
 
 
@@ -144,6 +145,8 @@ def vendor_detail(request, vendor_id):
             )
         
         vendor.delete()
+        clear_dashboard_cache(profile.organization_id)
+        clear_assessment_summary_cache(profile.organization_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -476,6 +479,7 @@ def incident_detail(request, incident_id):
             )
         
         incident.delete()
+        clear_dashboard_cache(profile.organization_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 